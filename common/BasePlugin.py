@@ -1,19 +1,43 @@
-import oracledb
 import logging
-import re
+import functools
 from abc import ABC, abstractmethod
-from typing import Dict, Optional, List, Tuple
-from .VaultClient import VaultClient
-from .Constants import SqlProcessing
+from contextlib import contextmanager
+from typing import Any, Dict, FrozenSet, NamedTuple, Optional, List, Tuple
+from .VaultClient import get_vault_client
+from .ConnectionPool import ConnectionPool
+from .Constants import SqlProcessing, Prefetch
+
+_NOT_CACHED = object()
+
+
+class FieldChange(NamedTuple):
+    old: Any
+    new: Any
+    mutable: bool
+
+
+class TableDesc(NamedTuple):
+    prefix: str
+    table: str
+    pk_fields: Tuple[str, ...]
+    entity_name: str
+    label: str
 
 
 class BasePlugin(ABC):
     
     def __init__(self, product_code: str, vault_config):
         self.product_code = product_code
-        self.vault = VaultClient(vault_config)
+        self.vault = get_vault_client(vault_config)
+        self.keep_local_copy = True
+        self.connection_pool = None
+        self._db_pool = None
         self._db_conn = None
+        self._statement_cursor = None
         self.sql_queries = []
+        self._column_cache: Dict[str, List[str]] = {}
+        self._record_cache: Dict[Tuple, Optional[Dict]] = {}
+        self._mutable_sets: Dict[str, FrozenSet[str]] = {}
     
     def get_sftp_config(self, env: str = 'dev'):
         raise NotImplementedError(
@@ -22,21 +46,31 @@ class BasePlugin(ABC):
     
     def get_db_connection(self):
         if self._db_conn is None:
-            creds = self.vault.get_db_credentials()
+            if self.connection_pool is None:
+                self.connection_pool = ConnectionPool()
             
-            dsn = oracledb.makedsn(
-                creds['host'],
-                creds.get('port', 1521),
-                service_name=creds['database']
-            )
-            
-            self._db_conn = oracledb.connect(
-                user=creds['username'],
-                password=creds['password'],
-                dsn=dsn
-            )
+            try:
+                self._db_conn = self._acquire_connection()
+            except Exception as e:
+                if not ConnectionPool.is_invalid_login(e):
+                    raise
+                logging.warning("DB rejected cached credentials, refetching from Vault")
+                self.vault.invalidate_credentials()
+                self._db_conn = self._acquire_connection()
         return self._db_conn
     
+    def _acquire_connection(self):
+        creds = self.vault.get_db_credentials()
+        self._db_pool = self.connection_pool.get_pool(creds)
+        return self._db_pool.acquire()
+    
+    @contextmanager
+    def connection(self):
+        try:
+            yield self.get_db_connection()
+        finally:
+            self.close_connection()
+    
     def begin_transaction(self):
         conn = self.get_db_connection()
         conn.autocommit = False
@@ -52,23 +86,42 @@ class BasePlugin(ABC):
         conn.rollback()
         logging.debug("Transaction rolled back")
     
-    def process_value_for_sql(self, value) -> Tuple[bool, any]:
+    def savepoint(self, name: str):
+        self.execute_query(f"SAVEPOINT {name}")
+    
+    def rollback_to_savepoint(self, name: str):
+        self.execute_query(f"ROLLBACK TO SAVEPOINT {name}")
+        logging.debug("Rolled back to savepoint %s", name)
+    
+    def _execute_statement(self, sql: str, params: list):
+        self.sql_queries.append({
+            'sql': sql,
+            'params': params
+        })
+        
+        if self._statement_cursor is None:
+            self._statement_cursor = self.get_db_connection().cursor()
+        self._statement_cursor.execute(sql, params)
+    
+    def process_value_for_sql(self, value) -> Tuple[str, bool, any]:
         if not isinstance(value, str):
-            return (False, value)
+            return (SqlProcessing.BIND, True, value)
         
         value_stripped = value.strip()
-        value_upper = value_stripped.upper()
         
-        if value_upper in SqlProcessing.SQL_KEYWORDS:
-            return (True, value_upper)
+        if len(value_stripped) <= SqlProcessing.MAX_KEYWORD_LENGTH and value_stripped.isalpha():
+            value_upper = value_stripped.upper()
+            if value_upper in SqlProcessing.SQL_KEYWORDS:
+                return (value_upper, False, None)
         
-        for pattern, oracle_format in SqlProcessing.DATE_PATTERNS:
-            if re.match(pattern, value_stripped):
-                return (True, f"TO_DATE('{value_stripped}', '{oracle_format}')")
+        match = SqlProcessing.DATE_REGEX.match(value_stripped)
+        if match:
+            oracle_format = SqlProcessing.DATE_FORMATS[match.lastgroup]
+            return (f"TO_DATE({SqlProcessing.BIND}, '{oracle_format}')", True, value_stripped)
         
-        return (False, value)
+        return (SqlProcessing.BIND, True, value)
     
-    def execute_query(self, sql: str, params: Optional[tuple] = None, fetch_one: bool = False):
+    def execute_query(self, sql: str, params: Optional[tuple] = None, fetch_one: bool = False, cache_key: Optional[str] = None):
         if sql.strip().upper().startswith(('INSERT', 'UPDATE')):
             self.sql_queries.append({
                 'sql': sql,
@@ -80,7 +133,11 @@ class BasePlugin(ABC):
         try:
             cursor.execute(sql, params or [])
             if fetch_one:
-                columns = [col[0].lower() for col in cursor.description]
+                columns = self._column_cache.get(cache_key) if cache_key else None
+                if columns is None:
+                    columns = [col[0].lower() for col in cursor.description]
+                    if cache_key:
+                        self._column_cache[cache_key] = columns
                 row = cursor.fetchone()
                 if row:
                     return dict(zip(columns, row))
@@ -92,52 +149,155 @@ class BasePlugin(ABC):
     
     def close_connection(self):
         if self._db_conn:
-            self._db_conn.close()
+            if self._statement_cursor is not None:
+                self._statement_cursor.close()
+                self._statement_cursor = None
+            self._db_pool.release(self._db_conn)
+            self._db_conn = None
+            self._db_pool = None
+        self.clear_record_cache()
+        self._column_cache = {}
+    
+    def get_prefetch_entities(self) -> List[Tuple[str, str, List[str]]]:
+        return []
+    
+    def clear_record_cache(self):
+        self._record_cache = {}
+    
+    def prefetch_records(self, rows: List[Dict]):
+        self.clear_record_cache()
+        
+        entities = self.get_prefetch_entities()
+        if not entities:
+            return
+        
+        row_tables = [self.extract_all_table_data(row) for row in rows]
+        
+        for table, prefix, pk_fields in entities:
+            keys = set()
+            for tables in row_tables:
+                data = tables.get(prefix, {})
+                pk_values = tuple(data.get(field) for field in pk_fields)
+                if all(pk_values):
+                    keys.add(pk_values)
+            
+            keys = sorted(keys)
+            for start in range(0, len(keys), Prefetch.BATCH_SIZE):
+                self._prefetch_batch(table, pk_fields, keys[start:start + Prefetch.BATCH_SIZE])
+    
+    def _prefetch_batch(self, table: str, pk_fields: List[str], keys: List[tuple]):
+        sql = self._build_prefetch_sql(table, tuple(pk_fields), len(keys))
+        values = [value for key in keys for value in key]
+        
+        conn = self.get_db_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.arraysize = Prefetch.ARRAY_SIZE
+            cursor.execute(sql, values)
+            columns = [col[0].lower() for col in cursor.description]
+            records = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+        
+        requested = {self.normalize_key(key): key for key in keys}
+        found = {}
+        unmatched = 0
+        for record in records:
+            key = requested.get(self.normalize_key(record.get(field) for field in pk_fields))
+            if key is None:
+                unmatched += 1
+            else:
+                found[key] = record
+        
+        for key in keys:
+            record = found.get(key)
+            if record is not None or not unmatched:
+                self._record_cache[(table, tuple(zip(pk_fields, key)))] = record
+        
+        if unmatched:
+            logging.debug(
+                "Prefetch of %s returned %d record(s) not matching requested keys; missing keys use per-row lookups",
+                table, unmatched
+            )
+        logging.debug("Prefetched %d/%d record(s) from %s", len(found), len(keys), table)
+    
+    @staticmethod
+    def normalize_key(values) -> Tuple[str, ...]:
+        return tuple('' if value is None else str(value).strip() for value in values)
     
     def fetch_current_record(self, table: str, key_fields: dict) -> Optional[Dict]:
-        where_parts = []
-        values = []
-        param_num = 1
+        cache_key = (table, tuple(key_fields.items()))
+        cached = self._record_cache.get(cache_key, _NOT_CACHED)
+        if cached is not _NOT_CACHED:
+            return cached
         
-        for field, value in key_fields.items():
-            where_parts.append(f"{field} = :{param_num}")
-            values.append(value)
-            param_num += 1
+        record = self._fetch_record(table, key_fields)
+        self._record_cache[cache_key] = record
+        return record
+    
+    def _fetch_record(self, table: str, key_fields: dict) -> Optional[Dict]:
+        sql = self._build_select_sql(table, tuple(key_fields))
+        return self.execute_query(sql, list(key_fields.values()), fetch_one=True, cache_key=table)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _build_select_sql(table: str, pk_fields: Tuple) -> str:
+        where_clause = ' AND '.join(f"{field} = :{i}" for i, field in enumerate(pk_fields, 1))
+        return f"SELECT * FROM {table} WHERE {where_clause}"
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=64)
+    def _build_prefetch_sql(table: str, pk_fields: Tuple, key_count: int) -> str:
+        width = len(pk_fields)
+        if width == 1:
+            in_list = ', '.join(f":{i}" for i in range(1, key_count + 1))
+            where_clause = f"{pk_fields[0]} IN ({in_list})"
+        else:
+            in_list = ', '.join(
+                '(' + ', '.join(f":{i * width + j}" for j in range(1, width + 1)) + ')'
+                for i in range(key_count)
+            )
+            where_clause = f"({', '.join(pk_fields)}) IN ({in_list})"
         
-        where_clause = ' AND '.join(where_parts)
-        sql = f"SELECT * FROM {table} WHERE {where_clause}"
-        return self.execute_query(sql, values, fetch_one=True)
+        return f"SELECT * FROM {table} WHERE {where_clause}"
     
-    def detect_changes(self, current: Dict, incoming: Dict, fields: List[str]) -> Dict:
+    def detect_changes(self, table: str, current: Dict, incoming: Dict, fields: List[str]) -> Dict[str, FieldChange]:
         changes = {}
-        mutable_fields = self.get_mutable_fields(incoming.get('_table', ''))
+        mutable_fields = self.get_mutable_set(table)
+        incoming_get = incoming.get
+        current_get = current.get
         
         for field in fields:
-            incoming_val = incoming.get(field)
-            current_val = current.get(field)
+            incoming_val = incoming_get(field)
             
             if incoming_val is None or incoming_val == '':
                 continue
             
+            current_val = current_get(field)
+            if incoming_val == current_val:
+                continue
+            
             incoming_str = str(incoming_val).strip()
             current_str = str(current_val).strip() if current_val is not None else ''
             
             if incoming_str != current_str:
-                changes[field] = {
-                    'old': current_val,
-                    'new': incoming_val,
-                    'mutable': field in mutable_fields
-                }
+                changes[field] = FieldChange(current_val, incoming_val, field in mutable_fields)
         
         return changes
     
-    def validate_mutability(self, changes: Dict, override: bool):
+    def get_mutable_set(self, table: str) -> FrozenSet[str]:
+        mutable_set = self._mutable_sets.get(table)
+        if mutable_set is None:
+            mutable_set = self._mutable_sets[table] = frozenset(self.get_mutable_fields(table))
+        return mutable_set
+    
+    def validate_mutability(self, changes: Dict[str, FieldChange], override: bool):
         if override:
             return
         
         immutable_changes = []
-        for field, change_info in changes.items():
-            if not change_info['mutable']:
+        for field, change in changes.items():
+            if not change.mutable:
                 immutable_changes.append(field)
         
         if immutable_changes:
@@ -148,98 +308,129 @@ class BasePlugin(ABC):
     def extract_table_data(self, row: Dict, prefix: str) -> Dict:
         table_data = {}
         prefix_dot = f"{prefix}."
+        prefix_len = len(prefix_dot)
         
         for key, value in row.items():
-            if key.startswith(prefix_dot):
-                field_name = key.replace(prefix_dot, '', 1)
-                if value and value.strip():
-                    table_data[field_name] = value.strip()
+            if key.startswith(prefix_dot) and value and (stripped := value.strip()):
+                table_data[key[prefix_len:]] = stripped
         
         return table_data
     
+    def extract_all_table_data(self, row: Dict) -> Dict[str, Dict]:
+        tables = {}
+        
+        for key, value in row.items():
+            prefix, dot, field = key.partition('.')
+            if dot and value and (stripped := value.strip()):
+                tables.setdefault(prefix, {})[field] = stripped
+        
+        return tables
+    
     def has_table_data(self, row: Dict, prefix: str) -> bool:
-        table_data = self.extract_table_data(row, prefix)
-        return len(table_data) > 0
+        prefix_dot = f"{prefix}."
+        return any(
+            key.startswith(prefix_dot) and value and value.strip()
+            for key, value in row.items()
+        )
     
-    def _insert(self, table: str, data: Dict):
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _build_insert_sql(table: str, columns: Tuple) -> str:
         fields = []
-        values = []
         placeholders = []
         
         param_num = 1
-        for key, value in data.items():
-            if key != '_table':
-                is_sql_func, processed_value = self.process_value_for_sql(value)
-                fields.append(key)
-                if is_sql_func:
-                    placeholders.append(processed_value)
-                else:
-                    placeholders.append(f':{param_num}')
-                    values.append(processed_value)
-                    param_num += 1
-        
-        sql = f"INSERT INTO {table} ({', '.join(fields)}) VALUES ({', '.join(placeholders)})"
-        self.execute_query(sql, values)
-    
-    def _update(self, table: str, pk_fields: Dict, data: Dict, changes: Dict):
+        for field, expression, needs_bind in columns:
+            fields.append(field)
+            if needs_bind:
+                placeholders.append(expression.format(bind=f':{param_num}'))
+                param_num += 1
+            else:
+                placeholders.append(expression)
+        
+        return f"INSERT INTO {table} ({', '.join(fields)}) VALUES ({', '.join(placeholders)})"
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _build_update_sql(table: str, columns: Tuple, pk_fields: Tuple) -> str:
         set_parts = []
-        values = []
         
         param_num = 1
-        for field in changes.keys():
-            if field in data:
-                is_sql_func, processed_value = self.process_value_for_sql(data[field])
-                if is_sql_func:
-                    set_parts.append(f"{field} = {processed_value}")
-                else:
-                    set_parts.append(f"{field} = :{param_num}")
-                    values.append(processed_value)
-                    param_num += 1
+        for field, expression, needs_bind in columns:
+            if needs_bind:
+                set_parts.append(f"{field} = {expression.format(bind=f':{param_num}')}")
+                param_num += 1
+            else:
+                set_parts.append(f"{field} = {expression}")
         
         where_parts = []
-        for field, value in pk_fields.items():
+        for field in pk_fields:
             where_parts.append(f"{field} = :{param_num}")
-            values.append(value)
             param_num += 1
         
         where_clause = ' AND '.join(where_parts)
-        sql = f"UPDATE {table} SET {', '.join(set_parts)} WHERE {where_clause}"
-        self.execute_query(sql, values)
+        return f"UPDATE {table} SET {', '.join(set_parts)} WHERE {where_clause}"
+    
+    def _insert(self, table: str, data: Dict):
+        columns = []
+        values = []
+        
+        for key, value in data.items():
+            expression, needs_bind, bind_value = self.process_value_for_sql(value)
+            columns.append((key, expression, needs_bind))
+            if needs_bind:
+                values.append(bind_value)
+        
+        sql = self._build_insert_sql(table, tuple(columns))
+        self._execute_statement(sql, values)
+    
+    def _update(self, table: str, pk_fields: Dict, data: Dict, changes: Dict[str, FieldChange]):
+        columns = []
+        values = []
+        
+        for field in changes.keys():
+            if field in data:
+                expression, needs_bind, bind_value = self.process_value_for_sql(data[field])
+                columns.append((field, expression, needs_bind))
+                if needs_bind:
+                    values.append(bind_value)
+        
+        values.extend(pk_fields.values())
+        
+        sql = self._build_update_sql(table, tuple(columns), tuple(pk_fields))
+        self._execute_statement(sql, values)
     
     def _process_entity(
         self,
         table: str,
         prefix: str,
         pk_fields: List[str],
-        row: Dict,
+        data: Dict,
         operation: str,
         override: bool,
         entity_name: str = None
     ) -> str:
         from .Constants import Operation, ProcessStatus
         
-        data = self.extract_table_data(row, prefix)
-        data['_table'] = table
-        
+        pk_dict = {}
         for pk_field in pk_fields:
-            if not data.get(pk_field):
+            pk_value = data.get(pk_field)
+            if not pk_value:
                 raise ValueError(f"{prefix}.{pk_field} is required")
+            pk_dict[pk_field] = pk_value
         
-        pk_dict = {pk_field: data[pk_field] for pk_field in pk_fields}
-        pk_values = [data[pk_field] for pk_field in pk_fields]
-        pk_display = '/'.join(pk_values)
-        
-        if entity_name is None:
-            entity_name = prefix.capitalize()
+        pk_display = '/'.join(pk_dict.values())
+        entity_name = entity_name or prefix.capitalize()
         
         if operation == Operation.INSERT:
             existing = self.fetch_current_record(table, pk_dict)
             if existing:
-                logging.warning(f"{entity_name} {pk_display} already exists, skipping INSERT")
+                logging.warning("%s %s already exists, skipping INSERT", entity_name, pk_display)
                 return ProcessStatus.SKIPPED
             
             self._insert(table, data)
-            logging.info(f"Inserted {entity_name.lower()}: {pk_display}")
+            self._record_cache.pop((table, tuple(pk_dict.items())), None)
+            logging.info("Inserted %s: %s", entity_name.lower(), pk_display)
             return ProcessStatus.INSERTED
             
         elif operation == Operation.UPDATE:
@@ -247,16 +438,17 @@ class BasePlugin(ABC):
             if not current:
                 raise ValueError(f"{entity_name} {pk_display} does not exist. Use INSERT operation.")
             
-            all_fields = list(data.keys())
-            changes = self.detect_changes(current, data, all_fields)
+            changes = self.detect_changes(table, current, data, list(data))
             
             if not changes:
-                logging.info(f"No changes detected for {entity_name.lower()} {pk_display}")
+                logging.info("No changes detected for %s %s", entity_name.lower(), pk_display)
                 return ProcessStatus.SKIPPED
             
             self.validate_mutability(changes, override)
             self._update(table, pk_dict, data, changes)
-            logging.info(f"Updated {entity_name.lower()}: {pk_display}, fields: {list(changes.keys())}")
+            self._record_cache.pop((table, tuple(pk_dict.items())), None)
+            if logging.getLogger().isEnabledFor(logging.INFO):
+                logging.info("Updated %s: %s, fields: %s", entity_name.lower(), pk_display, list(changes))
             return ProcessStatus.UPDATED
     
     def get_sql_queries(self) -> List[Dict]:
@@ -0,0 +1,79 @@
+import oracledb
+import hashlib
+import logging
+import threading
+from typing import Dict, List, Tuple
+from .Constants import DbPool
+
+
+class ConnectionPool:
+    
+    def __init__(self, min_size: int = DbPool.MIN, max_size: int = DbPool.MAX, increment: int = DbPool.INCREMENT):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.increment = increment
+        self._pools: Dict[Tuple, Tuple[str, oracledb.ConnectionPool]] = {}
+        self._retired: List[oracledb.ConnectionPool] = []
+        self._lock = threading.Lock()
+    
+    def get_pool(self, creds: Dict) -> oracledb.ConnectionPool:
+        key = (creds['host'], creds.get('port', 1521), creds['database'], creds['username'])
+        fingerprint = hashlib.sha256(str(creds['password']).encode()).hexdigest()
+        
+        entry = self._pools.get(key)
+        if entry is not None and entry[0] == fingerprint:
+            return entry[1]
+        
+        with self._lock:
+            entry = self._pools.get(key)
+            if entry is not None:
+                if entry[0] == fingerprint:
+                    return entry[1]
+                self.retire_pool(entry[1])
+                logging.info("DB credentials changed for %s@%s/%s, rebuilding pool", creds['username'], creds['host'], creds['database'])
+            
+            dsn = oracledb.makedsn(
+                creds['host'],
+                creds.get('port', 1521),
+                service_name=creds['database']
+            )
+            
+            pool = oracledb.create_pool(
+                user=creds['username'],
+                password=creds['password'],
+                dsn=dsn,
+                min=self.min_size,
+                max=self.max_size,
+                increment=self.increment,
+                getmode=oracledb.POOL_GETMODE_WAIT,
+                stmtcachesize=DbPool.STMT_CACHE_SIZE,
+                cclass=DbPool.CCLASS,
+                purity=oracledb.PURITY_SELF
+            )
+            self._pools[key] = (fingerprint, pool)
+            logging.info("Created DB connection pool: %s@%s/%s", creds['username'], creds['host'], creds['database'])
+        
+        return pool
+    
+    @staticmethod
+    def is_invalid_login(error: Exception) -> bool:
+        if not isinstance(error, oracledb.DatabaseError) or not error.args:
+            return False
+        return getattr(error.args[0], 'full_code', None) == DbPool.INVALID_LOGIN
+    
+    def retire_pool(self, pool: oracledb.ConnectionPool):
+        try:
+            pool.close()
+        except Exception:
+            self._retired.append(pool)
+    
+    def close(self):
+        pools = [pool for _, pool in self._pools.values()] + self._retired
+        for pool in pools:
+            try:
+                pool.close(force=True)
+            except Exception as e:
+                logging.error("Failed to close DB connection pool: %s", e)
+        self._pools = {}
+        self._retired = []
+        logging.debug("DB connection pools closed")
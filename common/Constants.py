@@ -1,6 +1,9 @@
+import re
+
 class Operation:
     INSERT = 'INSERT'
     UPDATE = 'UPDATE'
+    VALID = frozenset({INSERT, UPDATE})
 
 class ProcessStatus:
     INSERTED = 'inserted'
@@ -13,9 +16,12 @@ class MetadataField:
     JIRA = 'jira'
     OPERATION = 'operation'
     OVERRIDE = 'override'
+    REQUIRED = (PRODUCT, SUBMITTED_BY, JIRA, OPERATION)
 
 class FilePatterns:
-    CSV_FILENAME = r'^([Bb]\d{7})_([A-Z_]+)_(\d{8})\.csv$'
+    CSV_FILENAME = re.compile(r'^([Bb]\d{7})_([A-Z_]+)_(\d{8})\.csv$', re.ASCII)
+    PLUGIN_FILE = '*Plugin.py'
+    PLUGIN_CACHE = '.plugin_cache.json'
 
 class Directories:
     SQL_QUERIES = 'sqlqueries'
@@ -26,17 +32,92 @@ class Directories:
     LOGS = 'logs'
 
 class Formatting:
-    MAX_LOG_PREFIX_WIDTH = 90
+    MAX_LOG_PREFIX_WIDTH = 110
+    DEFAULT_COLUMNS = 80
     TIMESTAMP_WIDTH = 23
     LEVEL_WIDTH = 12
+    TERMINAL_REFRESH = 1.0
+    SQL_FILE_SEPARATOR = "=" * 80
+    BIND_PLACEHOLDER = re.compile(r':(\d+)')
+
+class Transaction:
+    COMMIT_CHUNK_SIZE = 500
+
+class Logging:
+    BUFFER_CAPACITY = 1024
 
 class SqlProcessing:
-    SQL_KEYWORDS = ['SYSDATE', 'SYSTIMESTAMP']
+    BIND = '{bind}'
     
-    DATE_PATTERNS = [
-        (r'^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$', 'YYYY-MM-DD HH24:MI:SS'),
-        (r'^\d{2}-\d{2}-\d{4} \d{2}:\d{2}:\d{2}$', 'DD-MM-YYYY HH24:MI:SS'),
-        (r'^\d{4}-\d{2}-\d{2}$', 'YYYY-MM-DD'),
-        (r'^\d{2}-\d{2}-\d{4}$', 'DD-MM-YYYY'),
-        (r'^\d{2}/\d{2}/\d{4}$', 'DD/MM/YYYY'),
-    ]
+    SQL_KEYWORDS = frozenset({'SYSDATE', 'SYSTIMESTAMP'})
+    MAX_KEYWORD_LENGTH = max(len(keyword) for keyword in SQL_KEYWORDS)
+    
+    DATE_FORMATS = {
+        'ymd_hms': 'YYYY-MM-DD HH24:MI:SS',
+        'dmy_hms': 'DD-MM-YYYY HH24:MI:SS',
+        'ymd': 'YYYY-MM-DD',
+        'dmy': 'DD-MM-YYYY',
+        'dmy_slash': 'DD/MM/YYYY',
+    }
+    
+    DATE_REGEX = re.compile(
+        r'^(?:'
+        r'(?P<ymd_hms>\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})'
+        r'|(?P<dmy_hms>\d{2}-\d{2}-\d{4} \d{2}:\d{2}:\d{2})'
+        r'|(?P<ymd>\d{4}-\d{2}-\d{2})'
+        r'|(?P<dmy>\d{2}-\d{2}-\d{4})'
+        r'|(?P<dmy_slash>\d{2}/\d{2}/\d{4})'
+        r')$'
+    )
+
+class DbPool:
+    MIN = 2
+    MAX = 10
+    INCREMENT = 1
+    STMT_CACHE_SIZE = 50
+    CCLASS = 'QUERY_AUTOMATION'
+    INVALID_LOGIN = 'ORA-01017'
+
+class Polling:
+    MIN_GAP = 1
+
+class SftpPool:
+    MAX_IDLE = 4
+    IDLE_TTL = 300
+    REAP_INTERVAL = 60
+
+class SftpTuning:
+    # None keeps kernel TCP autotuning; a fixed size disables it and is clamped to rmem_max/wmem_max
+    SOCKET_BUFFER = None
+    WINDOW_SIZE = 2 ** 31 - 1
+    MAX_PACKET_SIZE = 32768
+    REKEY_BYTES = 2 ** 40
+    PREFETCH_REQUESTS = 64
+    MAX_SESSIONS = 10
+    COPY_BUFFER = 1024 * 1024
+    DISABLED_ALGORITHMS = {
+        'kex': [
+            'diffie-hellman-group1-sha1',
+            'diffie-hellman-group14-sha1',
+            'diffie-hellman-group-exchange-sha1'
+        ],
+        'ciphers': ['3des-cbc', 'aes128-cbc', 'aes192-cbc', 'aes256-cbc'],
+        'macs': ['hmac-md5', 'hmac-sha1-96', 'hmac-md5-96']
+    }
+    CONNECT_TIMEOUT = 30
+
+class Prefetch:
+    BATCH_SIZE = 500
+    ARRAY_SIZE = 1000
+
+class VaultCache:
+    DEFAULT_TTL = 300
+    POOL_CONNECTIONS = 4
+    POOL_MAXSIZE = 16
+    RETRIES = 3
+    BACKOFF_FACTOR = 0.2
+    MAX_WORKERS = 8
+    JITTER_MIN = 0.85
+    RETRY_BASE = 60
+    RETRY_MAX = 900
+    TTL_FACTOR = 0.99
@@ -1,10 +1,15 @@
 import csv
+import codecs
 import logging
-import traceback
+import os
+import sys
+import threading
+from itertools import islice
+from logging.handlers import MemoryHandler
 from pathlib import Path
 from typing import Dict
 from common.PluginManager import PluginManager
-from common.Constants import Directories
+from common.Constants import Directories, Logging, MetadataField, Transaction, Formatting as FormattingConstants
 from utils.Formatting import get_separator, get_log_formatter, format_sql
 
 class CsvProcessor:
@@ -13,15 +18,16 @@ class CsvProcessor:
         self.plugin_manager = plugin_manager
     
     def extract_metadata(self, row: Dict) -> Dict:
+        get = row.get
         metadata = {
-            'product': row.get('meta.product', '').strip(),
-            'submitted_by': row.get('meta.submitted_by', '').strip(),
-            'jira': row.get('meta.jira', '').strip(),
-            'operation': row.get('meta.operation', '').strip().upper(),
-            'override': row.get('meta.override', 'false').strip().lower()
+            'product': (get('meta.product') or '').strip(),
+            'submitted_by': (get('meta.submitted_by') or '').strip(),
+            'jira': (get('meta.jira') or '').strip(),
+            'operation': sys.intern((get('meta.operation') or '').strip().upper()),
+            'override': (get('meta.override') or 'false').strip().lower() == 'true'
         }
         
-        for field in ['product', 'submitted_by', 'jira', 'operation']:
+        for field in MetadataField.REQUIRED:
             if not metadata[field]:
                 raise ValueError(f"Missing required metadata: meta.{field}")
         
@@ -36,179 +42,323 @@ class CsvProcessor:
         file_handler = logging.FileHandler(log_file)
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(formatter)
-        file_handler.set_name(f'product_{folder_name}')
+        
+        memory_handler = MemoryHandler(
+            capacity=Logging.BUFFER_CAPACITY,
+            flushLevel=logging.ERROR,
+            target=file_handler
+        )
+        memory_handler.setLevel(logging.DEBUG)
+        memory_handler.set_name(f'product_{folder_name}')
+        memory_handler.addFilter(lambda record, owner=threading.get_ident(): record.thread == owner)
         
         root_logger = logging.getLogger()
-        root_logger.addHandler(file_handler)
+        root_logger.addHandler(memory_handler)
         
-        logging.info(f"Product-specific log file: {log_file}")
+        logging.info("Product-specific log file: %s", log_file)
         
-        return file_handler
+        return memory_handler
     
     def remove_product_log_handler(self, handler):
         root_logger = logging.getLogger()
         root_logger.removeHandler(handler)
+        file_handler = handler.target
+        handler.flush()
         handler.close()
+        if file_handler:
+            file_handler.close()
     
     def process_csv_file(self, filepath: Path, folder_name: str, sql_dir: Path) -> bool:
         paths = self.plugin_manager.get_product_paths(folder_name)
         plugin = self.plugin_manager.get_plugin(folder_name)
         product_code = plugin.product_code
         
+        separator = get_separator()
         logging.info("")
-        logging.info(get_separator())
-        logging.info(f"PROCESSING FILE: {filepath.name} (Product: {product_code})")
-        logging.info(get_separator())
+        logging.info(separator)
+        logging.info("PROCESSING FILE: %s (Product: %s)", filepath.name, product_code)
+        logging.info(separator)
         
         product_handler = self.add_product_log_handler(folder_name, filepath.stem)
         
         try:
             processing_path = paths[Directories.PROCESSING] / filepath.name
-            filepath.rename(processing_path)
-            logging.info(f"Moved to processing: {processing_path}")
+            processed_path = paths[Directories.PROCESSED] / filepath.name
+            failed_path = paths[Directories.FAILED] / filepath.name
+            os.replace(filepath, processing_path)
+            logging.info("Moved to processing: %s", processing_path)
             
             total_rows = 0
-            successful_rows = []
-            failed_rows = []
-            jira_queries = {}
+            successful_rows, failed_rows, jira_queries = [], [], {}
             
             try:
-                with open(processing_path, 'r') as f:
-                    reader = csv.DictReader(f)
-                    rows = list(reader)
+                with open(processing_path, 'r', newline='') as f:
+                    total_rows = max(sum(1 for record in csv.reader(f) if record) - 1, 0)
                 
-                total_rows = len(rows)
-                logging.info(f"Total rows to process: {total_rows}")
+                logging.info("Total rows to process: %d", total_rows)
                 
-                if not rows:
+                if not total_rows:
                     raise ValueError("CSV file is empty")
                 
-                for row_num, row in enumerate(rows, start=2):
-                    logging.info("")
-                    logging.info(get_separator("-"))
-                    logging.info(f"PROCESSING ROW {row_num}/{total_rows + 1}")
-                    logging.info(get_separator("-"))
-                    
-                    try:
-                        metadata = self.extract_metadata(row)
-                        jira = metadata['jira']
-                        product = metadata['product']
-                        
-                        if product != product_code:
-                            raise ValueError(
-                                f"Metadata mismatch: CSV in {folder_name}/ folder has meta.product={product}, "
-                                f"expected {product_code}"
-                            )
-                        
-                        logging.info(
-                            f"Row {row_num}: Task ID={jira}, Product={product}, "
-                            f"Operation={metadata['operation']}, Override={metadata['override']}"
-                        )
-                        
-                        logging.info(f"Processing row {row_num}")
-                        plugin.begin_transaction()
-                        plugin.reset_sql_queries()
-                        
-                        try:
-                            logging.info(f"Calling plugin: {folder_name} ({product_code})")
-                            plugin.process_row(row, metadata)
-                            
-                            plugin.commit_transaction()
-                            successful_rows.append(row_num)
-                            logging.info(f"ROW {row_num} PROCESSED SUCCESSFULLY")
-                            
-                            if jira not in jira_queries:
-                                jira_queries[jira] = []
-                            jira_queries[jira].extend(plugin.get_sql_queries())
-                            
-                        except Exception as e:
-                            plugin.rollback_transaction()
-                            logging.error(f"Changes rolled back for row {row_num}")
-                            raise
-                        
-                    except Exception as e:
-                        failed_rows.append(row_num)
-                        error_msg = str(e)
-                        
-                        logging.error(f"ROW {row_num} FAILED")
-                        logging.error(f"Error message: {error_msg}")
-                        logging.error("Full stack trace:")
-                        logging.error(traceback.format_exc())
-                
-                plugin.close_connection()
+                with open(processing_path, 'r', newline='') as f:
+                    self.process_records(
+                        plugin, folder_name, f, total_rows + 1, successful_rows, failed_rows, jira_queries
+                    )
                 
-                if jira_queries:
-                    self.save_sql_queries(filepath.stem, jira_queries, sql_dir)
+            except Exception as e:
+                self.log_file_error(filepath.name, e)
                 
-                if successful_rows:
-                    processed_path = paths[Directories.PROCESSED] / filepath.name
-                    processing_path.rename(processed_path)
-                    if failed_rows:
-                        final_status = "PARTIAL SUCCESS"
-                    else:
-                        final_status = "SUCCESS"
-                    final_path = processed_path
-                else:
-                    failed_path = paths[Directories.FAILED] / filepath.name
-                    processing_path.rename(failed_path)
-                    final_status = "FAILED"
-                    final_path = failed_path
+                if not successful_rows:
+                    os.replace(processing_path, failed_path)
+                    logging.error("File moved to: %s", failed_path)
+                    raise
                 
-                logging.info("")
-                logging.info(get_separator())
-                logging.info(f"FILE PROCESSING COMPLETE: {filepath.name}")
-                logging.info(get_separator())
-                logging.info(f"Status: {final_status}")
-                logging.info(f"Total Rows: {total_rows}")
-                logging.info(f"Successful: {len(successful_rows)} rows")
-                logging.info(f"Failed: {len(failed_rows)} rows")
-                if successful_rows:
-                    logging.info(f"Successful rows: {successful_rows}")
-                if failed_rows:
-                    logging.error(f"Failed rows: {failed_rows}")
-                logging.info(f"Final location: {final_path}")
-                logging.info(get_separator())
+                logging.error("%d row(s) of %s were already committed, finishing as processed", len(successful_rows), filepath.name)
+            
+            finally:
+                plugin.close_connection()
+            
+            self.save_committed_queries(filepath.stem, jira_queries, sql_dir)
+            
+            final_path = processed_path if successful_rows else failed_path
+            try:
+                os.replace(processing_path, final_path)
+            except OSError as e:
+                logging.error("Could not move %s to %s, leaving it in processing/: %s", filepath.name, final_path, e)
+                final_path = processing_path
+            
+            final_status = self.log_summary(filepath.name, total_rows, successful_rows, failed_rows, final_path)
+            return final_status != "FAILED"
+        
+        finally:
+            self.remove_product_log_handler(product_handler)
+    
+    def process_csv_stream(self, stream, filename: str, folder_name: str, sql_dir: Path) -> bool:
+        plugin = self.plugin_manager.get_plugin(folder_name)
+        product_code = plugin.product_code
+        csv_filename = Path(filename).stem
+        
+        separator = get_separator()
+        logging.info("")
+        logging.info(separator)
+        logging.info("PROCESSING STREAM: %s (Product: %s)", filename, product_code)
+        logging.info(separator)
+        
+        product_handler = self.add_product_log_handler(folder_name, csv_filename)
+        
+        try:
+            successful_rows, failed_rows, jira_queries = [], [], {}
+            
+            try:
+                lines = codecs.iterdecode(stream, 'utf-8')
+                self.process_records(plugin, folder_name, lines, '?', successful_rows, failed_rows, jira_queries)
                 
-                return final_status != "FAILED"
+                if not successful_rows and not failed_rows:
+                    raise ValueError("CSV file is empty")
                 
             except Exception as e:
-                logging.error("")
-                logging.error(get_separator())
-                logging.error(f"ERROR PROCESSING FILE: {filepath.name}")
-                logging.error(get_separator())
-                logging.error(f"Error: {str(e)}")
-                logging.error("Full stack trace:")
-                logging.error(traceback.format_exc())
-                logging.error(get_separator())
+                self.log_file_error(filename, e)
                 
-                failed_path = paths[Directories.FAILED] / filepath.name
-                processing_path.rename(failed_path)
-                logging.error(f"File moved to: {failed_path}")
+                if not successful_rows:
+                    raise
                 
-                raise
+                logging.error("%d row(s) of %s were already committed, finishing as processed", len(successful_rows), filename)
+            
+            finally:
+                plugin.close_connection()
+            
+            self.save_committed_queries(csv_filename, jira_queries, sql_dir)
+            
+            total_rows = len(successful_rows) + len(failed_rows)
+            final_status = self.log_summary(filename, total_rows, successful_rows, failed_rows, "remote")
+            return final_status != "FAILED"
         
         finally:
             self.remove_product_log_handler(product_handler)
     
+    def process_records(
+        self,
+        plugin,
+        folder_name: str,
+        lines,
+        total_label,
+        successful_rows: list,
+        failed_rows: list,
+        jira_queries: dict
+    ):
+        product_code = plugin.product_code
+        pending_rows = []
+        
+        reader = csv.reader(lines)
+        header = [sys.intern(name) for name in next(reader, [])]
+        
+        verbose = logging.getLogger().isEnabledFor(logging.DEBUG)
+        row_separator = get_separator("-") if verbose else None
+        
+        for chunk in self.read_chunks(reader, header):
+            self.prefetch_records(plugin, chunk)
+            
+            for row_num, row in chunk:
+                if verbose:
+                    logging.debug("")
+                    logging.debug(row_separator)
+                logging.info("PROCESSING ROW %d/%s", row_num, total_label)
+                if verbose:
+                    logging.debug(row_separator)
+                
+                try:
+                    metadata = self.extract_metadata(row)
+                    jira = metadata['jira']
+                    product = metadata['product']
+                    
+                    if product != product_code:
+                        raise ValueError(
+                            f"Metadata mismatch: CSV in {folder_name}/ folder has meta.product={product}, "
+                            f"expected {product_code}"
+                        )
+                    
+                    logging.info(
+                        "Row %d: Task ID=%s, Product=%s, Operation=%s, Override=%s",
+                        row_num, jira, product, metadata['operation'], metadata['override']
+                    )
+                    
+                    logging.info("Processing row %d", row_num)
+                    if not pending_rows:
+                        plugin.begin_transaction()
+                    plugin.reset_sql_queries()
+                    savepoint = f"ROW_{row_num}"
+                    plugin.savepoint(savepoint)
+                    
+                    try:
+                        logging.info("Calling plugin: %s (%s)", folder_name, product_code)
+                        plugin.process_row(row, metadata)
+                        
+                        pending_rows.append((row_num, jira, plugin.get_sql_queries()))
+                        logging.info("ROW %d PROCESSED SUCCESSFULLY", row_num)
+                        
+                    except Exception as e:
+                        plugin.rollback_to_savepoint(savepoint)
+                        logging.error("Changes rolled back for row %d", row_num)
+                        raise
+                    
+                except Exception as e:
+                    failed_rows.append(row_num)
+                    error_msg = str(e)
+                    
+                    logging.error("ROW %d FAILED", row_num)
+                    logging.error("Error message: %s", error_msg)
+                    logging.error("Full stack trace:", exc_info=True)
+                
+            self.commit_rows(plugin, pending_rows, successful_rows, failed_rows, jira_queries)
+    
+    def log_summary(self, filename: str, total_rows: int, successful_rows: list, failed_rows: list, final_location) -> str:
+        if not successful_rows:
+            final_status = "FAILED"
+        elif failed_rows:
+            final_status = "PARTIAL SUCCESS"
+        else:
+            final_status = "SUCCESS"
+        
+        separator = get_separator()
+        logging.info("")
+        logging.info(separator)
+        logging.info("FILE PROCESSING COMPLETE: %s", filename)
+        logging.info(separator)
+        logging.info("Status: %s", final_status)
+        logging.info("Total Rows: %d", total_rows)
+        logging.info("Successful: %d rows", len(successful_rows))
+        logging.info("Failed: %d rows", len(failed_rows))
+        if successful_rows:
+            logging.info("Successful rows: %s", successful_rows)
+        if failed_rows:
+            logging.error("Failed rows: %s", failed_rows)
+        logging.info("Final location: %s", final_location)
+        logging.info(separator)
+        
+        return final_status
+    
+    def log_file_error(self, filename: str, error: Exception):
+        separator = get_separator()
+        logging.error("")
+        logging.error(separator)
+        logging.error("ERROR PROCESSING FILE: %s", filename)
+        logging.error(separator)
+        logging.error("Error: %s", error)
+        logging.error("Full stack trace:", exc_info=True)
+        logging.error(separator)
+    
+    def read_chunks(self, reader, header: list):
+        records = enumerate(filter(None, reader), start=2)
+        while True:
+            chunk = [
+                (row_num, dict(zip(header, record)))
+                for row_num, record in islice(records, Transaction.COMMIT_CHUNK_SIZE)
+            ]
+            if not chunk:
+                return
+            yield chunk
+    
+    def prefetch_records(self, plugin, chunk: list):
+        try:
+            plugin.prefetch_records([row for _, row in chunk])
+        except Exception as e:
+            plugin.clear_record_cache()
+            logging.warning("Record prefetch failed, falling back to per-row lookups: %s", e)
+    
+    def commit_rows(self, plugin, pending_rows: list, successful_rows: list, failed_rows: list, jira_queries: dict):
+        if not pending_rows:
+            return
+        
+        row_nums = [row_num for row_num, _, _ in pending_rows]
+        
+        try:
+            plugin.commit_transaction()
+        except Exception as e:
+            plugin.rollback_transaction()
+            failed_rows.extend(row_nums)
+            failed_rows.sort()
+            logging.error("Commit failed, rolled back rows: %s", row_nums)
+            logging.error("Error message: %s", e)
+            logging.error("Full stack trace:", exc_info=True)
+        else:
+            successful_rows.extend(row_nums)
+            for _, jira, queries in pending_rows:
+                jira_queries.setdefault(jira, []).extend(queries)
+            logging.info("Committed %d row(s)", len(row_nums))
+        
+        pending_rows.clear()
+    
+    def save_committed_queries(self, csv_filename: str, jira_queries: dict, sql_dir: Path):
+        if not jira_queries:
+            return
+        
+        try:
+            self.save_sql_queries(csv_filename, jira_queries, sql_dir)
+        except Exception as e:
+            logging.error("Failed to save SQL queries for %s: %s", csv_filename, e, exc_info=True)
+    
     def save_sql_queries(self, csv_filename: str, jira_queries: dict, sql_dir: Path):
         logging.info("")
         logging.info("Saving SQL queries...")
         
+        separator = FormattingConstants.SQL_FILE_SEPARATOR
+        query_separator = f"\n\n{separator}\n\n"
+        
         for jira, queries in jira_queries.items():
             sql_file = sql_dir / f"{jira}_{csv_filename}.sql"
             
-            with open(sql_file, 'w') as f:
-                f.write(f"JIRA Ticket: {jira}\n")
-                f.write(f"CSV File: {csv_filename}.csv\n")
-                f.write(f"Total Queries: {len(queries)}\n")
-                f.write("=" * 80 + "\n\n")
-                
-                for idx, query in enumerate(queries, 1):
-                    formatted_query = format_sql(query)
-                    f.write(f"Query {idx}:\n")
-                    f.write(formatted_query)
-                    f.write("\n\n" + "=" * 80 + "\n\n")
+            parts = [
+                f"JIRA Ticket: {jira}\n",
+                f"CSV File: {csv_filename}.csv\n",
+                f"Total Queries: {len(queries)}\n",
+                f"{separator}\n\n"
+            ]
+            parts.extend(
+                f"Query {idx}:\n{format_sql(query['sql'], query['params'])}{query_separator}"
+                for idx, query in enumerate(queries, 1)
+            )
+            sql_file.write_text(''.join(parts))
             
-            logging.info(f"Saved {len(queries)} queries to: {sql_file}")
+            logging.info("Saved %d queries to: %s", len(queries), sql_file)
         
-        logging.info(f"Total JIRA tickets: {len(jira_queries)}")
+        logging.info("Total JIRA tickets: %d", len(jira_queries))
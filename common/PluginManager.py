@@ -1,9 +1,14 @@
+import os
+import json
 import logging
+import importlib
 import importlib.util
 from pathlib import Path
 from typing import Dict, Optional
 from common.BasePlugin import BasePlugin
-from common.Constants import Directories
+from common.ConnectionPool import ConnectionPool
+from common.VaultClient import get_many_db_credentials
+from common.Constants import Directories, FilePatterns
 
 class PluginManager:
     
@@ -13,6 +18,7 @@ class PluginManager:
         
         self.plugins = self.discover_products()
         self._plugin_instances = {}
+        self.connection_pool = ConnectionPool()
         
         self.product_paths = {}
         for folder_name in self.plugins.keys():
@@ -25,54 +31,109 @@ class PluginManager:
                 Directories.LOGS: product_dir / Directories.LOGS
             }
             
-            for path in self.product_paths[folder_name].values():
-                path.mkdir(parents=True, exist_ok=True)
+            with os.scandir(product_dir) as entries:
+                existing = {entry.name for entry in entries if entry.is_dir()}
+            
+            for name, path in self.product_paths[folder_name].items():
+                if name not in existing:
+                    path.mkdir(parents=True, exist_ok=True)
         
-        logging.info(f"Loaded {len(self.plugins)} product(s): {list(self.plugins.keys())}")
+        logging.info("Loaded %d product(s): %s", len(self.plugins), list(self.plugins.keys()))
+    
+    def load_plugin_cache(self) -> Dict[str, Dict]:
+        cache_file = self.products_dir / FilePatterns.PLUGIN_CACHE
+        try:
+            return json.loads(cache_file.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logging.warning("Ignoring unreadable plugin cache %s: %s", cache_file, e)
+            return {}
+    
+    def save_plugin_cache(self, cache: Dict[str, Dict]):
+        cache_file = self.products_dir / FilePatterns.PLUGIN_CACHE
+        try:
+            cache_file.write_text(json.dumps(cache, indent=2, sort_keys=True))
+        except OSError as e:
+            logging.warning("Could not write plugin cache %s: %s", cache_file, e)
+    
+    def find_plugin_file(self, product_dir: Path, cached: Optional[Dict]) -> Optional[Path]:
+        if cached:
+            plugin_file = product_dir / cached['file']
+            try:
+                if plugin_file.stat().st_mtime_ns == cached['mtime']:
+                    return plugin_file
+            except OSError:
+                pass
+        
+        plugin_files = sorted(product_dir.glob(FilePatterns.PLUGIN_FILE))
+        
+        if not plugin_files:
+            return None
+        
+        if len(plugin_files) > 1:
+            logging.warning("Multiple plugin files in %s/, using first: %s", product_dir.name, plugin_files[0].name)
+        
+        return plugin_files[0]
+    
+    def load_plugin_module(self, folder_name: str, plugin_file: Path):
+        module_name = f"products.{folder_name}.{plugin_file.stem}"
+        
+        try:
+            module = importlib.import_module(module_name)
+        except ModuleNotFoundError as e:
+            if e.name is None or not module_name.startswith(e.name):
+                raise
+        else:
+            if Path(module.__file__).resolve() == plugin_file.resolve():
+                return module
+        
+        spec = importlib.util.spec_from_file_location(module_name, plugin_file)
+        if not spec or not spec.loader:
+            return None
+        
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
     
     def discover_products(self) -> Dict[str, type]:
         plugins = {}
+        cache = self.load_plugin_cache()
+        discovered = {}
         
         for product_dir in self.products_dir.iterdir():
             if not product_dir.is_dir():
                 continue
             
             folder_name = product_dir.name
-            plugin_files = list(product_dir.glob('*Plugin.py'))
+            plugin_file = self.find_plugin_file(product_dir, cache.get(folder_name))
             
-            if not plugin_files:
-                logging.warning(f"No plugin file found in {folder_name}/, skipping")
+            if plugin_file is None:
+                logging.warning("No plugin file found in %s/, skipping", folder_name)
                 continue
             
-            if len(plugin_files) > 1:
-                logging.warning(f"Multiple plugin files in {folder_name}/, using first: {plugin_files[0].name}")
-            
-            plugin_file = plugin_files[0]
             plugin_class_name = plugin_file.stem
             
             try:
-                spec = importlib.util.spec_from_file_location(
-                    f"products.{folder_name}.{plugin_class_name}",
-                    plugin_file
-                )
+                module = self.load_plugin_module(folder_name, plugin_file)
                 
-                if spec and spec.loader:
-                    module = importlib.util.module_from_spec(spec)
-                    spec.loader.exec_module(module)
-                    
-                    if hasattr(module, plugin_class_name):
-                        plugin_class = getattr(module, plugin_class_name)
-                        plugins[folder_name] = plugin_class
-                        logging.info(f"Loaded plugin: {folder_name} ({plugin_class_name})")
-                    else:
-                        logging.error(
-                            f"Plugin file {plugin_file.name} does not contain class {plugin_class_name}"
-                        )
+                if module is None:
+                    logging.error("Could not load spec for %s", plugin_file)
+                elif hasattr(module, plugin_class_name):
+                    plugin_class = getattr(module, plugin_class_name)
+                    plugins[folder_name] = plugin_class
+                    discovered[folder_name] = {
+                        'file': plugin_file.name,
+                        'mtime': plugin_file.stat().st_mtime_ns
+                    }
+                    logging.info("Loaded plugin: %s (%s)", folder_name, plugin_class_name)
                 else:
-                    logging.error(f"Could not load spec for {plugin_file}")
+                    logging.error(
+                        "Plugin file %s does not contain class %s", plugin_file.name, plugin_class_name
+                    )
                     
             except Exception as e:
-                logging.error(f"Failed to load plugin from {folder_name}: {str(e)}")
+                logging.error("Failed to load plugin from %s: %s", folder_name, e)
                 continue
         
         if not plugins:
@@ -80,14 +141,19 @@ class PluginManager:
                 "No product plugins found! Ensure products/<product_name>/<Product>Plugin.py exists"
             )
         
+        if discovered != cache:
+            self.save_plugin_cache(discovered)
+        
         return plugins
     
     def get_plugin(self, folder_name: str) -> Optional[BasePlugin]:
         if folder_name not in self._plugin_instances:
             plugin_class = self.plugins.get(folder_name)
             if plugin_class:
-                self._plugin_instances[folder_name] = plugin_class()
-                logging.debug(f"Instantiated plugin for {folder_name}")
+                plugin = plugin_class()
+                plugin.connection_pool = self.connection_pool
+                self._plugin_instances[folder_name] = plugin
+                logging.debug("Instantiated plugin for %s", folder_name)
             else:
                 return None
         return self._plugin_instances.get(folder_name)
@@ -97,3 +163,24 @@ class PluginManager:
     
     def get_all_products(self) -> list:
         return list(self.plugins.keys())
+    
+    def warm_credentials(self):
+        shared = {}
+        for folder_name in self.plugins:
+            vault = self.get_plugin(folder_name).vault
+            shared.setdefault(id(vault), (folder_name, vault))
+        vault_clients = dict(shared.values())
+        
+        try:
+            get_many_db_credentials(vault_clients)
+            logging.debug("Fetched DB credentials for: %s", list(vault_clients))
+        except Exception as e:
+            logging.warning("Could not prefetch DB credentials: %s", e)
+    
+    def close_all(self):
+        for plugin in self._plugin_instances.values():
+            try:
+                plugin.close_connection()
+            except Exception as e:
+                logging.error("Failed to close connection for %s: %s", plugin.product_code, e)
+        self.connection_pool.close()
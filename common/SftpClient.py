@@ -1,78 +1,167 @@
 import paramiko
 import logging
 import os
+import shutil
+import socket
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict
+from .Constants import SftpTuning
 
 
 class SftpClient:
     
-    def __init__(self, sftp_config):
+    def __init__(self, sftp_config, prefetch_requests: int = None, compress: bool = None):
         self.host = sftp_config['host']
         self.port = sftp_config.get('port', 22)
         self.username = sftp_config['username']
         self.password = sftp_config.get('password')
         self.key_file = sftp_config.get('key_file')
+        self.socket_buffer = sftp_config.get('socket_buffer', SftpTuning.SOCKET_BUFFER)
+        self.prefetch_requests = prefetch_requests or sftp_config.get('prefetch_requests', SftpTuning.PREFETCH_REQUESTS)
+        self.compress = sftp_config.get('compress', False) if compress is None else compress
         
         self.transport = None
         self.sftp = None
+        self._sessions = []
         self.connect()
     
     def connect(self):
         try:
-            self.transport = paramiko.Transport((self.host, self.port))
+            self.transport = paramiko.Transport(
+                self.open_socket(),
+                disabled_algorithms=SftpTuning.DISABLED_ALGORITHMS
+            )
+            self.transport.default_window_size = SftpTuning.WINDOW_SIZE
+            self.transport.default_max_packet_size = SftpTuning.MAX_PACKET_SIZE
+            self.transport.use_compression(self.compress)
+            # Fewer rekeys on long transfers; keys still rotate every REKEY_BYTES
+            self.transport.packetizer.REKEY_BYTES = SftpTuning.REKEY_BYTES
             
             if self.key_file:
-                private_key = paramiko.RSAKey.from_private_key_file(self.key_file)
+                private_key = self.load_private_key(self.key_file)
                 self.transport.connect(username=self.username, pkey=private_key)
             else:
                 self.transport.connect(username=self.username, password=self.password)
             
             self.sftp = paramiko.SFTPClient.from_transport(self.transport)
-            logging.info(f"Connected to SFTP: {self.host}:{self.port}")
+            logging.info("Connected to SFTP: %s:%s", self.host, self.port)
             
         except Exception as e:
             raise Exception(f"SFTP connection failed: {e}")
     
-    def list_files(self, remote_path: str) -> List[str]:
+    def load_private_key(self, key_file: str) -> paramiko.PKey:
+        last_error = None
+        for key_class in (paramiko.Ed25519Key, paramiko.ECDSAKey, paramiko.RSAKey):
+            try:
+                return key_class.from_private_key_file(key_file)
+            except paramiko.PasswordRequiredException:
+                raise
+            except paramiko.SSHException as e:
+                last_error = e
+        raise paramiko.SSHException(f"Unsupported or unreadable private key: {key_file}") from last_error
+    
+    def open_socket(self) -> socket.socket:
+        last_error = None
+        for family, socktype, proto, _, address in socket.getaddrinfo(self.host, self.port, type=socket.SOCK_STREAM):
+            sock = socket.socket(family, socktype, proto)
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                if self.socket_buffer:
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.socket_buffer)
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.socket_buffer)
+                sock.settimeout(SftpTuning.CONNECT_TIMEOUT)
+                sock.connect(address)
+                sock.settimeout(None)
+                return sock
+            except OSError as e:
+                sock.close()
+                last_error = e
+        
+        raise last_error or OSError(f"No addresses found for {self.host}:{self.port}")
+    
+    def is_alive(self) -> bool:
+        if self.transport is None or not self.transport.is_active():
+            return False
+        try:
+            self.transport.send_ignore()
+            return True
+        except Exception:
+            return False
+    
+    def open_session(self) -> paramiko.SFTPClient:
+        return paramiko.SFTPClient.from_transport(self.transport)
+    
+    def list_files(self, remote_path: str, session: paramiko.SFTPClient = None) -> List[paramiko.SFTPAttributes]:
         try:
             files = []
-            for entry in self.sftp.listdir_attr(remote_path):
+            for entry in (session or self.sftp).listdir_attr(remote_path):
                 if not entry.st_mode & 0o040000:
-                    files.append(entry.filename)
+                    files.append(entry)
             return files
         except FileNotFoundError:
             return []
         except Exception as e:
-            logging.error(f"Failed to list files in {remote_path}: {e}")
+            logging.error("Failed to list files in %s: %s", remote_path, e)
             return []
     
-    def download_file(self, remote_path: str, local_path: str):
+    def list_files_many(
+        self,
+        remote_paths: List[str],
+        max_sessions: int = SftpTuning.MAX_SESSIONS
+    ) -> Dict[str, List[paramiko.SFTPAttributes]]:
+        if len(remote_paths) <= 1:
+            return {remote_path: self.list_files(remote_path) for remote_path in remote_paths}
+        
+        session_count = min(len(remote_paths), max_sessions)
+        while len(self._sessions) < session_count - 1:
+            self._sessions.append(self.open_session())
+        sessions = [self.sftp] + self._sessions[:session_count - 1]
+        
+        def list_group(session, paths):
+            return {remote_path: self.list_files(remote_path, session) for remote_path in paths}
+        
+        groups = [remote_paths[i::session_count] for i in range(session_count)]
+        listings = {}
+        with ThreadPoolExecutor(max_workers=session_count) as executor:
+            for listing in executor.map(list_group, sessions, groups):
+                listings.update(listing)
+        return listings
+    
+    def open_remote(self, remote_path: str, file_size: int = None) -> paramiko.SFTPFile:
+        remote_file = self.sftp.open(remote_path, 'rb', bufsize=-1)
+        remote_file.prefetch(file_size, max_concurrent_requests=self.prefetch_requests)
+        return remote_file
+    
+    def download_file(self, remote_path: str, local_path: str, file_size: int = None):
+        temp_path = f"{local_path}.tmp"
         try:
-            temp_path = f"{local_path}.tmp"
-            self.sftp.get(remote_path, temp_path)
+            with self.open_remote(remote_path, file_size) as remote_file, open(temp_path, 'wb') as local_file:
+                shutil.copyfileobj(remote_file, local_file, SftpTuning.COPY_BUFFER)
             
-            os.rename(temp_path, local_path)
-            logging.debug(f"Downloaded: {remote_path} -> {local_path}")
+            os.replace(temp_path, local_path)
+            logging.debug("Downloaded: %s -> %s", remote_path, local_path)
             
         except Exception as e:
-            if os.path.exists(f"{local_path}.tmp"):
-                os.remove(f"{local_path}.tmp")
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
             raise Exception(f"Failed to download {remote_path}: {e}")
     
     def move_file(self, source_path: str, dest_path: str):
         try:
             self.sftp.rename(source_path, dest_path)
-            logging.debug(f"Moved on SFTP: {source_path} -> {dest_path}")
+            logging.debug("Moved on SFTP: %s -> %s", source_path, dest_path)
         except Exception as e:
             raise Exception(f"Failed to move file on SFTP: {e}")
     
     def delete_file(self, remote_path: str):
         try:
             self.sftp.remove(remote_path)
-            logging.debug(f"Deleted from SFTP: {remote_path}")
+            logging.debug("Deleted from SFTP: %s", remote_path)
         except Exception as e:
-            logging.error(f"Failed to delete {remote_path}: {e}")
+            logging.error("Failed to delete %s: %s", remote_path, e)
     
     def ensure_directory(self, remote_path: str):
         try:
@@ -80,11 +169,14 @@ class SftpClient:
         except FileNotFoundError:
             try:
                 self.sftp.mkdir(remote_path)
-                logging.debug(f"Created SFTP directory: {remote_path}")
+                logging.debug("Created SFTP directory: %s", remote_path)
             except Exception as e:
-                logging.error(f"Failed to create directory {remote_path}: {e}")
+                logging.error("Failed to create directory %s: %s", remote_path, e)
     
     def close(self):
+        for session in self._sessions:
+            session.close()
+        self._sessions = []
         if self.sftp:
             self.sftp.close()
         if self.transport:
@@ -0,0 +1,120 @@
+import queue
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Tuple
+from .SftpClient import SftpClient
+from .Constants import SftpPool
+
+
+class SftpConnectionPool:
+    
+    def __init__(self, max_idle: int = SftpPool.MAX_IDLE, idle_ttl: float = SftpPool.IDLE_TTL):
+        self.max_idle = max_idle
+        self.idle_ttl = idle_ttl
+        self._idle: Dict[Tuple, queue.Queue] = {}
+        self._lock = threading.Lock()
+        self._closed = threading.Event()
+        self._reaper = None
+    
+    def _get_queue(self, sftp_config) -> queue.Queue:
+        key = (
+            sftp_config['host'],
+            sftp_config.get('port', 22),
+            sftp_config['username'],
+            bool(sftp_config.get('compress', False))
+        )
+        
+        with self._lock:
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap, name='sftp-pool-reaper', daemon=True)
+                self._reaper.start()
+            if key not in self._idle:
+                self._idle[key] = queue.Queue(maxsize=self.max_idle)
+            return self._idle[key]
+    
+    @contextmanager
+    def acquire(self, sftp_config):
+        idle = self._get_queue(sftp_config)
+        client = self._checkout(idle)
+        if client is None:
+            client = SftpClient(sftp_config)
+        
+        try:
+            yield client
+        finally:
+            self._checkin(idle, client)
+    
+    def _checkout(self, idle: queue.Queue):
+        while True:
+            try:
+                client, _ = idle.get_nowait()
+            except queue.Empty:
+                return None
+            
+            if client.is_alive():
+                return client
+            
+            logging.debug("Discarding dead SFTP connection: %s:%s", client.host, client.port)
+            self._close_client(client)
+    
+    def _checkin(self, idle: queue.Queue, client: SftpClient):
+        if self._closed.is_set() or not client.is_alive():
+            self._close_client(client)
+            return
+        
+        try:
+            idle.put_nowait((client, time.monotonic()))
+        except queue.Full:
+            self._close_client(client)
+    
+    def _reap(self):
+        while not self._closed.wait(SftpPool.REAP_INTERVAL):
+            cutoff = time.monotonic() - self.idle_ttl
+            
+            with self._lock:
+                queues = list(self._idle.values())
+            
+            for idle in queues:
+                fresh = []
+                while True:
+                    try:
+                        entry = idle.get_nowait()
+                    except queue.Empty:
+                        break
+                    
+                    if entry[1] < cutoff:
+                        logging.debug("Closing idle SFTP connection: %s:%s", entry[0].host, entry[0].port)
+                        self._close_client(entry[0])
+                    else:
+                        fresh.append(entry)
+                
+                for entry in fresh:
+                    try:
+                        idle.put_nowait(entry)
+                    except queue.Full:
+                        self._close_client(entry[0])
+    
+    def _close_client(self, client: SftpClient):
+        try:
+            client.close()
+        except Exception as e:
+            logging.error("Failed to close SFTP connection: %s", e)
+    
+    def close(self):
+        self._closed.set()
+        
+        with self._lock:
+            queues = list(self._idle.values())
+            self._idle = {}
+        
+        for idle in queues:
+            while True:
+                try:
+                    client, _ = idle.get_nowait()
+                except queue.Empty:
+                    break
+                self._close_client(client)
+        
+        logging.debug("SFTP connection pools closed")
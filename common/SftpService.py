@@ -1,14 +1,17 @@
-import os
 import logging
+import threading
 import time
-import traceback
-import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict
+from paramiko import SFTPAttributes
+from typing import Dict, List, Set, Tuple
 from common.PluginManager import PluginManager
 from common.CsvProcessor import CsvProcessor
-from common.Constants import Directories
+from common.Constants import Directories, Polling
+from common.SftpConnectionPool import SftpConnectionPool
 from utils.FileValidator import FileValidator
+from utils.Formatting import get_separator
+from utils.Environment import get_env
 
 class SftpService:
     
@@ -21,100 +24,66 @@ class SftpService:
         self.plugin_manager = plugin_manager
         self.csv_processor = csv_processor
         self.poll_interval = poll_interval
+        self.sftp_pool = None
+        self._stranded: Dict[str, Set[Tuple]] = {}
+        self._empty: Dict[str, Set[Tuple]] = {}
     
     def sftp_mode(self, sql_dir: Path):
-        from utils.Formatting import get_separator
-        from common.SftpClient import SftpClient
-        
         logging.info(get_separator())
         logging.info("SFTP POLLING SERVICE")
         logging.info(get_separator())
         
-        logging.info(f"Poll interval: {self.poll_interval} seconds")
+        logging.info("Poll interval: %d seconds", self.poll_interval)
         logging.info("")
         
-        sftp_clients = {}
+        sftp_products = {}
+        self.sftp_pool = SftpConnectionPool()
+        executor = None
         
         try:
+            env = get_env()
+            
             for folder_name in self.plugin_manager.get_all_products():
                 plugin = self.plugin_manager.get_plugin(folder_name)
-                
-                env = os.getenv('ENV', 'dev').lower()
                 sftp_config = plugin.get_sftp_config(env)
                 
-                sftp_clients[folder_name] = {
-                    'client': SftpClient(sftp_config),
+                with self.sftp_pool.acquire(sftp_config):
+                    pass
+                
+                sftp_products[folder_name] = {
+                    'config': sftp_config,
                     'base_path': sftp_config['base_path']
                 }
-                logging.info(f"Connected to SFTP for {folder_name}: {sftp_config['host']}")
+                logging.info("Connected to SFTP for %s: %s", folder_name, sftp_config['host'])
+            
+            self.plugin_manager.warm_credentials()
             
             logging.info(get_separator())
             logging.info("Polling started. Press Ctrl+C to stop.")
             logging.info(get_separator())
             
+            executor = ThreadPoolExecutor(max_workers=max(len(sftp_products), 1), thread_name_prefix='sftp-poll')
+            
+            next_tick = time.monotonic()
+            
             while True:
-                for folder_name, sftp_info in sftp_clients.items():
-                    sftp = sftp_info['client']
-                    base_path = sftp_info['base_path']
-                    remote_inbox = f"{base_path}/inbox"
-                    
-                    try:
-                        files = sftp.list_files(remote_inbox)
-                        
-                        for filename in files:
-                            if not filename.endswith('.csv'):
-                                continue
-                            
-                            try:
-                                remote_failed = f"{base_path}/failed/{filename}"
-                                product_code = self.plugin_manager.get_plugin(folder_name).product_code
-                                
-                                if not FileValidator.validate_csv_filename(filename, product_code):
-                                    sftp.move_file(f"{remote_inbox}/{filename}", remote_failed)
-                                    continue
-                                
-                                logging.info("")
-                                logging.info(get_separator("-"))
-                                logging.info(f"NEW FILE ON SFTP: {filename}")
-                                logging.info(get_separator("-"))
-                                
-                                remote_processing = f"{base_path}/processing/{filename}"
-                                sftp.move_file(f"{remote_inbox}/{filename}", remote_processing)
-                                
-                                local_inbox = self.plugin_manager.get_product_paths(folder_name)[Directories.INBOX]
-                                local_file = local_inbox / filename
-                                
-                                sftp.download_file(remote_processing, str(local_file))
-                                logging.info(f"Downloaded to: {local_file}")
-                                
-                                self.csv_processor.process_csv_file(local_file, folder_name, sql_dir)
-                                
-                                if local_file.exists():
-                                    processed_path = self.plugin_manager.get_product_paths(folder_name)[Directories.PROCESSED] / filename
-                                    if processed_path.exists():
-                                        remote_processed = f"{base_path}/processed/{filename}"
-                                        sftp.move_file(remote_processing, remote_processed)
-                                        logging.info(f"Moved on SFTP to: processed/{filename}")
-                                    else:
-                                        failed_path = self.plugin_manager.get_product_paths(folder_name)[Directories.FAILED] / filename
-                                        if failed_path.exists():
-                                            remote_failed = f"{base_path}/failed/{filename}"
-                                            sftp.move_file(remote_processing, remote_failed)
-                                            logging.info(f"Moved on SFTP to: failed/{filename}")
-                                
-                            except Exception as e:
-                                logging.error(f"Error processing {filename}: {e}")
-                                logging.error(traceback.format_exc())
-                                try:
-                                    remote_failed = f"{base_path}/failed/{filename}"
-                                    sftp.move_file(f"{remote_inbox}/{filename}", remote_failed)
-                                except:
-                                    pass
-                    
-                    except Exception as e:
-                        logging.error(f"Error polling {folder_name}: {e}")
+                listings = self._list_inboxes(sftp_products, executor)
+                futures = [
+                    executor.submit(self._poll_product, folder_name, sftp_products[folder_name], files, sql_dir)
+                    for folder_name, files in listings.items()
+                    if files
+                ]
+                for future in futures:
+                    future.result()
                 
-                time.sleep(self.poll_interval)
+                for handler in logging.getLogger().handlers:
+                    handler.flush()
+                
+                next_tick += self.poll_interval
+                now = time.monotonic()
+                if next_tick < now:
+                    next_tick = now + Polling.MIN_GAP
+                time.sleep(next_tick - now)
         
         except KeyboardInterrupt:
             logging.info("")
@@ -122,8 +91,128 @@ class SftpService:
             logging.info("Polling stopped by user")
             logging.info(get_separator())
         finally:
-            for sftp_info in sftp_clients.values():
-                try:
-                    sftp_info['client'].close()
-                except:
-                    pass
+            if executor:
+                executor.shutdown(wait=True)
+            self.sftp_pool.close()
+    
+    def _list_inboxes(self, sftp_products: Dict, executor: ThreadPoolExecutor) -> Dict[str, List[SFTPAttributes]]:
+        connections = {}
+        for folder_name, sftp_info in sftp_products.items():
+            config = sftp_info['config']
+            key = (config['host'], config.get('port', 22), config['username'], bool(config.get('compress', False)))
+            connections.setdefault(key, []).append(folder_name)
+        
+        def list_connection(folder_names):
+            config = sftp_products[folder_names[0]]['config']
+            threading.current_thread().name = config['host']
+            inboxes = {f"{sftp_products[name]['base_path']}/inbox": name for name in folder_names}
+            try:
+                with self.sftp_pool.acquire(config) as sftp:
+                    listing = sftp.list_files_many(list(inboxes))
+                return {inboxes[inbox]: files for inbox, files in listing.items()}
+            except Exception as e:
+                logging.error("Error listing inboxes on %s: %s", config['host'], e)
+                return {}
+        
+        listings = {}
+        for listing in executor.map(list_connection, connections.values()):
+            listings.update(listing)
+        return listings
+    
+    def _poll_product(self, folder_name: str, sftp_info: Dict, files: List[SFTPAttributes], sql_dir: Path):
+        threading.current_thread().name = folder_name
+        
+        base_path = sftp_info['base_path']
+        remote_inbox = f"{base_path}/inbox"
+        
+        plugin = self.plugin_manager.get_plugin(folder_name)
+        product_code = plugin.product_code
+        paths = self.plugin_manager.get_product_paths(folder_name)
+        local_inbox = paths[Directories.INBOX]
+        
+        signatures = {(entry.filename, entry.st_size, entry.st_mtime) for entry in files}
+        stranded = self._stranded.setdefault(folder_name, set())
+        stranded.intersection_update(signatures)
+        empty = self._empty.setdefault(folder_name, set())
+        empty.intersection_update(signatures)
+        
+        try:
+            with self.sftp_pool.acquire(sftp_info['config']) as sftp:
+                for entry in files:
+                    filename = entry.filename
+                    if not filename.endswith('.csv'):
+                        continue
+                    
+                    signature = (filename, entry.st_size, entry.st_mtime)
+                    if signature in stranded:
+                        logging.debug("Skipping SFTP file still in inbox until it changes: %s", filename)
+                        continue
+                    
+                    if not entry.st_size:
+                        if signature in empty:
+                            stranded.add(signature)
+                            logging.warning("SFTP file is still empty since the last poll; skipping it until it changes: %s", filename)
+                        else:
+                            empty.add(signature)
+                            logging.debug("Skipping empty SFTP file until it has content: %s", filename)
+                        continue
+                    
+                    remote_file_path = f"{remote_inbox}/{filename}"
+                    remote_processing = f"{base_path}/{Directories.PROCESSING}/{filename}"
+                    remote_processed = f"{base_path}/{Directories.PROCESSED}/{filename}"
+                    remote_failed = f"{base_path}/{Directories.FAILED}/{filename}"
+                    
+                    try:
+                        if not FileValidator.validate_csv_filename(filename, product_code):
+                            sftp.move_file(remote_file_path, remote_failed)
+                            continue
+                        
+                        sftp.move_file(remote_file_path, remote_processing)
+                    except Exception as e:
+                        stranded.add(signature)
+                        logging.warning("Could not move %s out of the SFTP inbox; skipping it until it changes: %s", filename, e)
+                        continue
+                    
+                    separator = get_separator("-")
+                    logging.info("")
+                    logging.info(separator)
+                    logging.info("NEW FILE ON SFTP: %s", filename)
+                    logging.info(separator)
+                    
+                    try:
+                        if plugin.keep_local_copy:
+                            local_file = local_inbox / filename
+                            
+                            sftp.download_file(remote_processing, str(local_file), entry.st_size)
+                            logging.info("Downloaded to: %s", local_file)
+                            
+                            succeeded = self.csv_processor.process_csv_file(local_file, folder_name, sql_dir)
+                        else:
+                            with sftp.open_remote(remote_processing, entry.st_size) as remote_file:
+                                succeeded = self.csv_processor.process_csv_stream(
+                                    remote_file, filename, folder_name, sql_dir
+                                )
+                    
+                    except Exception as e:
+                        logging.error("Error processing %s: %s", filename, e, exc_info=True)
+                        succeeded = False
+                    
+                    destination = remote_processed if succeeded else remote_failed
+                    self.finish_remote_file(sftp, sftp_info['config'], remote_processing, destination)
+        
+        except Exception as e:
+            logging.error("Error polling %s: %s", folder_name, e)
+    
+    def finish_remote_file(self, sftp, sftp_config: Dict, remote_processing: str, destination: str):
+        try:
+            sftp.move_file(remote_processing, destination)
+        except Exception as e:
+            logging.warning("Move to %s failed, retrying on a fresh connection: %s", destination, e)
+            try:
+                with self.sftp_pool.acquire(sftp_config) as retry_sftp:
+                    retry_sftp.move_file(remote_processing, destination)
+            except Exception as e:
+                logging.error("Could not move %s to %s, leaving it in processing/ for review: %s", remote_processing, destination, e)
+                return
+        
+        logging.info("Moved on SFTP to: %s", destination)
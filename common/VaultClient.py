@@ -1,7 +1,51 @@
 import hvac
-import os
+import requests
+from hvac.exceptions import Forbidden
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import time
+import random
+import threading
 import logging
-from typing import Dict
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Tuple
+from .Constants import VaultCache
+from utils.Environment import get_env
+
+
+@functools.lru_cache(maxsize=None)
+def get_vault_session() -> requests.Session:
+    adapter = HTTPAdapter(
+        pool_connections=VaultCache.POOL_CONNECTIONS,
+        pool_maxsize=VaultCache.POOL_MAXSIZE,
+        max_retries=Retry(total=VaultCache.RETRIES, backoff_factor=VaultCache.BACKOFF_FACTOR)
+    )
+    
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+@functools.lru_cache(maxsize=None)
+def connect_vault(url: str, token: str, env: str) -> hvac.Client:
+    try:
+        client = hvac.Client(
+            url=url,
+            token=token,
+            verify=False,
+            session=get_vault_session()
+        )
+        
+        if not client.is_authenticated():
+            raise Exception("Failed to authenticate with Vault - invalid token")
+        
+        logging.info("Connected to Vault (%s): %s", env, url)
+        return client
+        
+    except Exception as e:
+        raise Exception(f"Vault connection failed: {e}")
 
 
 class VaultClient:
@@ -10,7 +54,7 @@ class VaultClient:
         if vault_config is None:
             raise ValueError("vault_config is required (product's VaultConfig class)")
         
-        env = os.getenv('ENV', 'dev').lower()
+        env = get_env()
         
         if env == 'dev':
             config = vault_config.DEV
@@ -32,31 +76,72 @@ class VaultClient:
         if not self.secret_path or self.secret_path.startswith('<'):
             raise ValueError(f"Secret path not configured for {env} environment in VaultConfig")
         
+        self.client = connect_vault(self.vault_url, self.vault_token, env)
+        
+        self._secrets: Dict[str, Tuple[float, Dict]] = {}
+        self._lock = threading.RLock()
+        self._failures = 0
+    
+    def get_token_ttl(self) -> float:
         try:
-            self.client = hvac.Client(
-                url=self.vault_url,
-                token=self.vault_token,
-                verify=False
-            )
-            
-            if not self.client.is_authenticated():
-                raise Exception("Failed to authenticate with Vault - invalid token")
-            
-            logging.info(f"Connected to Vault ({env}): {self.vault_url}")
-            
+            ttl = self.client.auth.token.lookup_self()['data'].get('ttl') or 0
+        except Forbidden:
+            raise Exception("Vault token is no longer valid")
         except Exception as e:
-            raise Exception(f"Vault connection failed: {e}")
+            logging.warning("Could not look up Vault token TTL, using default: %s", e)
+            ttl = 0
+        
+        if ttl <= 0:
+            return VaultCache.DEFAULT_TTL
+        return min(ttl * VaultCache.TTL_FACTOR, VaultCache.DEFAULT_TTL)
+    
+    def invalidate_credentials(self):
+        with self._lock:
+            self._secrets = {}
     
     def get_secret(self, path: str) -> Dict:
+        with self._lock:
+            cached = self._secrets.get(path)
+        if cached is not None and time.monotonic() < cached[0]:
+            return dict(cached[1])
+        
         try:
             response = self.client.secrets.kv.v2.read_secret_version(path=path)
-            return response['data']['data']
+            data = response['data']['data']
         except Exception as e:
-            raise Exception(f"Failed to read secret from path '{path}': {e}")
+            if cached is None or isinstance(e, Forbidden):
+                raise Exception(f"Failed to read secret from path '{path}': {e}") from e
+            
+            with self._lock:
+                delay = min(VaultCache.RETRY_BASE * 2 ** self._failures, VaultCache.RETRY_MAX)
+                self._failures += 1
+                self._secrets[path] = (time.monotonic() + delay, cached[1])
+            logging.warning("Vault read for '%s' failed, reusing cached secret for %ss: %s", path, delay, e)
+            return dict(cached[1])
+        
+        lease_duration = response.get('lease_duration') or 0
+        if lease_duration > 0:
+            ttl = lease_duration * VaultCache.TTL_FACTOR
+        else:
+            ttl = self.get_token_ttl()
+        
+        ttl *= random.uniform(VaultCache.JITTER_MIN, 1.0)
+        with self._lock:
+            self._failures = 0
+            self._secrets[path] = (time.monotonic() + ttl, data)
+        return dict(data)
     
     def get_db_credentials(self) -> Dict:
         try:
-            credentials = self.get_secret(self.secret_path)
+            try:
+                credentials = self.get_secret(self.secret_path)
+            except Exception as e:
+                if not isinstance(e.__cause__, Forbidden):
+                    raise
+                logging.warning("Vault denied secret read, re-validating token")
+                self.invalidate_credentials()
+                self.get_token_ttl()
+                credentials = self.get_secret(self.secret_path)
             
             required_fields = ['host', 'username', 'password', 'database']
             missing = [f for f in required_fields if f not in credentials]
@@ -72,3 +157,19 @@ class VaultClient:
             
         except Exception as e:
             raise Exception(f"Failed to fetch credentials from {self.secret_path}: {e}")
+
+@functools.lru_cache(maxsize=None)
+def get_vault_client(vault_config) -> VaultClient:
+    return VaultClient(vault_config)
+
+
+def get_many_db_credentials(vault_clients: Dict[str, VaultClient]) -> Dict[str, Dict]:
+    if not vault_clients:
+        return {}
+    
+    with ThreadPoolExecutor(max_workers=min(VaultCache.MAX_WORKERS, len(vault_clients))) as executor:
+        futures = {
+            name: executor.submit(client.get_db_credentials)
+            for name, client in vault_clients.items()
+        }
+        return {name: future.result() for name, future in futures.items()}
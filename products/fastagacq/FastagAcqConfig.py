@@ -1,3 +1,5 @@
+import re
+
 class Product:
     CODE = 'FASTAG_ACQ'
     FOLDER = 'fastagacq'
@@ -21,14 +23,16 @@ class SftpConfig:
         'port': 22,
         'username': '<username>',
         'password': '<password>',
-        'base_path': 'products/fastagacq'
+        'base_path': 'products/fastagacq',
+        'compress': True
     }
     PROD = {
         'host': '<sftp_host>',
         'port': 22,
         'username': '<username>',
         'password': '<password>',
-        'base_path': 'products/fastagacq'
+        'base_path': 'products/fastagacq',
+        'compress': True
     }
 
 class Tables:
@@ -48,3 +52,11 @@ class FieldRules:
         Tables.VEHICLE_MAPPING: ['modified_ts'],
         Tables.USER_MAPPING: ['modified_ts']
     }
+
+class Validation:
+    JIRA_PATTERN = re.compile(r'APB-[0-9]+')
+    ALLOWED_SUBMITTERS = frozenset({'olm_id'})
+    PLAZA_REQUIREMENTS = {
+        'parking': ('conc', 'lane'),
+        'toll': ('conc', 'lane', 'fare', 'vmap')
+    }
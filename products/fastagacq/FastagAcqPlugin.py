@@ -2,16 +2,30 @@ import sys
 from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
-import os
-import re
 import logging
-from typing import Dict, List
-from .FastagAcqConfig import Product, Tables, FieldRules, VaultConfig, SftpConfig
-from common.BasePlugin import BasePlugin
+from typing import Dict, List, Tuple
+from .FastagAcqConfig import Product, Tables, FieldRules, Validation, VaultConfig, SftpConfig
+from common.BasePlugin import BasePlugin, TableDesc
 from common.Constants import Operation, ProcessStatus
+from utils.Environment import get_env
 
 class FastagAcqPlugin(BasePlugin):
     
+    TABLE_DESCRIPTORS = {
+        'plaza': TableDesc('plaza', Tables.PLAZA, ('plaza_id',), 'Plaza', 'plaza'),
+        'conc': TableDesc('conc', Tables.CONCESSIONAIRE, ('concessionaire_id',), 'Concessionaire', 'concessionaire'),
+        'lane': TableDesc('lane', Tables.LANE, ('plaza_id', 'lane_id'), 'Lane', 'lane'),
+        'fare': TableDesc('fare', Tables.FARE, ('fare_id',), 'Fare', 'fare'),
+        'vmap': TableDesc('vmap', Tables.VEHICLE_MAPPING, ('plaza_id', 'mvc_id'), 'Vehicle Mapping', 'vehicle_mapping'),
+        'umap': TableDesc('umap', Tables.USER_MAPPING, ('user_id',), 'User Mapping', 'user_mapping')
+    }
+    
+    OUTCOME_LOGS = (
+        (ProcessStatus.INSERTED, logging.INFO, "Tables inserted: %s"),
+        (ProcessStatus.SKIPPED, logging.WARNING, "Tables skipped (already exist): %s"),
+        (ProcessStatus.UPDATED, logging.INFO, "Tables updated: %s")
+    )
+    
     def __init__(self):
         super().__init__(Product.CODE, VaultConfig)
         
@@ -23,162 +37,93 @@ class FastagAcqPlugin(BasePlugin):
         self.TABLE_USER_MAPPING = Tables.USER_MAPPING
         
         self.MUTABLE_FIELDS = FieldRules.MUTABLE
+        self.enforce_submitter_allowlist = get_env() == 'production'
     
     def get_mutable_fields(self, table: str) -> List[str]:
         return self.MUTABLE_FIELDS.get(table, [])
     
+    def get_prefetch_entities(self) -> List[Tuple[str, str, List[str]]]:
+        return [
+            (desc.table, desc.prefix, list(desc.pk_fields))
+            for desc in self.TABLE_DESCRIPTORS.values()
+        ]
+    
     def get_sftp_config(self, env: str = 'dev'):
         return SftpConfig.DEV if env == 'dev' else SftpConfig.PROD
     
     def validate_metadata(self, metadata: Dict):
-        required = ['product', 'submitted_by', 'jira', 'operation']
-        for field in required:
-            if not metadata.get(field):
-                raise ValueError(f"Missing required metadata field: meta.{field}")
-        
-        if not re.match(r'^APB-[0-9]+$', metadata['jira']):
+        if not Validation.JIRA_PATTERN.fullmatch(metadata['jira']):
             raise ValueError(
                 f"Invalid jira format: {metadata['jira']}. "
                 "Expected format: APB-XXXXXX"
             )
         
-        if metadata['operation'] not in [Operation.INSERT, Operation.UPDATE]:
+        if metadata['operation'] not in Operation.VALID:
             raise ValueError(
                 f"Invalid operation: {metadata['operation']}. Must be INSERT or UPDATE"
             )
         
-        if os.getenv('ENV') == 'production':
-            allowed_submitters = ['olm_id']
-            if metadata['submitted_by'] not in allowed_submitters:
-                raise ValueError(
-                    f"Submitter '{metadata['submitted_by']}' not in allowlist"
-                )
+        if self.enforce_submitter_allowlist and metadata['submitted_by'] not in Validation.ALLOWED_SUBMITTERS:
+            raise ValueError(
+                f"Submitter '{metadata['submitted_by']}' not in allowlist"
+            )
     
     def process_row(self, row: Dict, metadata: Dict):
         self.validate_metadata(metadata)
         
         operation = metadata['operation']
-        override = metadata.get('override', 'false').lower() == 'true'
-        
-        logging.info(f"Processing row: jira={metadata['jira']}, operation={operation}, override={override}")
-        
-        if self.has_table_data(row, 'plaza'):
-            plaza_type = self.extract_table_data(row, 'plaza').get('type', '').strip().lower()
-            
-            if plaza_type == 'parking':
-                if not self.has_table_data(row, 'conc'):
-                    raise ValueError("For parking plaza type, concessionaire data is mandatory")
-                if not self.has_table_data(row, 'lane'):
-                    raise ValueError("For parking plaza type, lane data is mandatory")
-            elif plaza_type == 'toll':
-                if not self.has_table_data(row, 'conc'):
-                    raise ValueError("For toll plaza type, concessionaire data is mandatory")
-                if not self.has_table_data(row, 'lane'):
-                    raise ValueError("For toll plaza type, lane data is mandatory")
-                if not self.has_table_data(row, 'fare'):
-                    raise ValueError("For toll plaza type, fare data is mandatory")
-                if not self.has_table_data(row, 'vmap'):
-                    raise ValueError("For toll plaza type, vehicle mapping data is mandatory")
-        
-        results = {
-            ProcessStatus.INSERTED: [],
-            ProcessStatus.SKIPPED: [],
-            ProcessStatus.UPDATED: []
-        }
-        
-        if self.has_table_data(row, 'plaza'):
-            status = self.process_plaza(row, metadata, override)
-            results[status].append('plaza')
-        
-        if self.has_table_data(row, 'conc'):
-            status = self.process_concessionaire(row, metadata, override)
-            results[status].append('concessionaire')
-        
-        if self.has_table_data(row, 'lane'):
-            status = self.process_lane(row, metadata, override)
-            results[status].append('lane')
-        
-        if self.has_table_data(row, 'fare'):
-            status = self.process_fare(row, metadata, override)
-            results[status].append('fare')
-        
-        if self.has_table_data(row, 'vmap'):
-            status = self.process_vehicle_mapping(row, metadata, override)
-            results[status].append('vehicle_mapping')
-        
-        if self.has_table_data(row, 'umap'):
-            status = self.process_user_mapping(row, metadata, override)
-            results[status].append('user_mapping')
-        
-        if results[ProcessStatus.INSERTED]:
-            logging.info(f"Tables inserted: {results[ProcessStatus.INSERTED]}")
-        if results[ProcessStatus.SKIPPED]:
-            logging.warning(f"Tables skipped (already exist): {results[ProcessStatus.SKIPPED]}")
-        if results[ProcessStatus.UPDATED]:
-            logging.info(f"Tables updated: {results[ProcessStatus.UPDATED]}")
+        override = metadata['override']
+        
+        logging.info("Processing row: jira=%s, operation=%s, override=%s", metadata['jira'], operation, override)
+        
+        extracted = self.extract_all_table_data(row)
+        
+        plaza_data = extracted.get('plaza')
+        if plaza_data:
+            plaza_type = plaza_data.get('type', '').lower()
+            requirements = Validation.PLAZA_REQUIREMENTS.get(plaza_type, ())
+            missing = [
+                self.TABLE_DESCRIPTORS[prefix].entity_name.lower()
+                for prefix in requirements if prefix not in extracted
+            ]
+            if missing:
+                raise ValueError(f"For {plaza_type} plaza type, {', '.join(missing)} data is mandatory")
+        
+        outcomes = [
+            (self._process_table(desc, extracted[prefix], metadata, override), desc.label)
+            for prefix, desc in self.TABLE_DESCRIPTORS.items() if prefix in extracted
+        ]
+        
+        for status, level, message in self.OUTCOME_LOGS:
+            labels = [label for outcome, label in outcomes if outcome == status]
+            if labels:
+                logging.log(level, message, labels)
     
-    def process_plaza(self, row: Dict, metadata: Dict, override: bool) -> str:
+    def _process_table(self, desc: TableDesc, data: Dict, metadata: Dict, override: bool) -> str:
         return self._process_entity(
-            table=self.TABLE_PLAZA,
-            prefix='plaza',
-            pk_fields=['plaza_id'],
-            row=row,
+            table=desc.table,
+            prefix=desc.prefix,
+            pk_fields=list(desc.pk_fields),
+            data=data,
             operation=metadata['operation'],
             override=override,
-            entity_name='Plaza'
+            entity_name=desc.entity_name
         )
     
+    def process_plaza(self, row: Dict, metadata: Dict, override: bool) -> str:
+        return self._process_table(self.TABLE_DESCRIPTORS['plaza'], self.extract_table_data(row, 'plaza'), metadata, override)
+    
     def process_concessionaire(self, row: Dict, metadata: Dict, override: bool) -> str:
-        return self._process_entity(
-            table=self.TABLE_CONCESSIONAIRE,
-            prefix='conc',
-            pk_fields=['concessionaire_id'],
-            row=row,
-            operation=metadata['operation'],
-            override=override,
-            entity_name='Concessionaire'
-        )
+        return self._process_table(self.TABLE_DESCRIPTORS['conc'], self.extract_table_data(row, 'conc'), metadata, override)
     
     def process_lane(self, row: Dict, metadata: Dict, override: bool) -> str:
-        return self._process_entity(
-            table=self.TABLE_LANE,
-            prefix='lane',
-            pk_fields=['plaza_id', 'lane_id'],
-            row=row,
-            operation=metadata['operation'],
-            override=override,
-            entity_name='Lane'
-        )
+        return self._process_table(self.TABLE_DESCRIPTORS['lane'], self.extract_table_data(row, 'lane'), metadata, override)
     
     def process_fare(self, row: Dict, metadata: Dict, override: bool) -> str:
-        return self._process_entity(
-            table=self.TABLE_FARE,
-            prefix='fare',
-            pk_fields=['fare_id'],
-            row=row,
-            operation=metadata['operation'],
-            override=override,
-            entity_name='Fare'
-        )
+        return self._process_table(self.TABLE_DESCRIPTORS['fare'], self.extract_table_data(row, 'fare'), metadata, override)
     
     def process_vehicle_mapping(self, row: Dict, metadata: Dict, override: bool) -> str:
-        return self._process_entity(
-            table=self.TABLE_VEHICLE_MAPPING,
-            prefix='vmap',
-            pk_fields=['plaza_id', 'mvc_id'],
-            row=row,
-            operation=metadata['operation'],
-            override=override,
-            entity_name='Vehicle Mapping'
-        )
+        return self._process_table(self.TABLE_DESCRIPTORS['vmap'], self.extract_table_data(row, 'vmap'), metadata, override)
     
     def process_user_mapping(self, row: Dict, metadata: Dict, override: bool) -> str:
-        return self._process_entity(
-            table=self.TABLE_USER_MAPPING,
-            prefix='umap',
-            pk_fields=['user_id'],
-            row=row,
-            operation=metadata['operation'],
-            override=override,
-            entity_name='User Mapping'
-        )
+        return self._process_table(self.TABLE_DESCRIPTORS['umap'], self.extract_table_data(row, 'umap'), metadata, override)
@@ -4,36 +4,49 @@ import os
 import sys
 import re
 import logging
-import traceback
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import MemoryHandler
 from pathlib import Path
 from typing import Dict
 from dotenv import load_dotenv
 
 from utils.Formatting import get_separator, get_log_formatter
 from utils.FileValidator import FileValidator
-from common.Constants import Directories
+from common.Constants import Directories, Logging
 from common.PluginManager import PluginManager
 from common.CsvProcessor import CsvProcessor
-from common.SftpService import SftpService
 
 
 
 load_dotenv()
 
+BASE_DIR = Path(__file__).resolve().parent
+
 def setup_logging():
-    log_dir = Path(__file__).parent / 'logs'
+    log_dir = BASE_DIR / 'logs'
     log_dir.mkdir(exist_ok=True)
     log_file = log_dir / 'query.log'
     
     formatter = get_log_formatter()
     
-    file_handler = logging.FileHandler(log_file)
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    
+    file_handler = logging.FileHandler(log_file, delay=True)
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(formatter)
     
+    memory_handler = MemoryHandler(
+        capacity=Logging.BUFFER_CAPACITY,
+        flushLevel=logging.ERROR,
+        target=file_handler
+    )
+    memory_handler.setLevel(logging.DEBUG)
+    
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.DEBUG)
-    root_logger.addHandler(file_handler)
+    root_logger.addHandler(memory_handler)
     
     if os.getenv('ENV') != 'production' or sys.stdout.isatty():
         console_handler = logging.StreamHandler()
@@ -46,7 +59,7 @@ def setup_logging():
 LOG_FILE = setup_logging()
 logging.info(get_separator())
 logging.info("QUERY AUTOMATION STARTED")
-logging.info(f"Log file: {LOG_FILE}")
+logging.info("Log file: %s", LOG_FILE)
 logging.info(get_separator())
 
 
@@ -54,57 +67,71 @@ logging.info(get_separator())
 class QueryRunner:
     
     def __init__(self):
-        base_dir = Path(__file__).parent
-        products_dir = base_dir / 'products'
+        products_dir = BASE_DIR / 'products'
         
         self.plugin_manager = PluginManager(products_dir)
         self.csv_processor = CsvProcessor(self.plugin_manager)
         
-        poll_interval = int(os.getenv('SFTP_POLL_INTERVAL', 60))
-        self.sftp_service = SftpService(self.plugin_manager, self.csv_processor, poll_interval)
-        
-        self.sql_dir = base_dir / Directories.SQL_QUERIES
+        self.sql_dir = BASE_DIR / Directories.SQL_QUERIES
         self.sql_dir.mkdir(exist_ok=True)
 
     
     def scan_inbox(self):
         logging.info("Scanning product inboxes for CSV files...")
         
-        for folder_name in self.plugin_manager.get_all_products():
-            paths = self.plugin_manager.get_product_paths(folder_name)
-            inbox_path = paths[Directories.INBOX]
-            plugin = self.plugin_manager.get_plugin(folder_name)
-            product_code = plugin.product_code
-            
-            csv_files = list(inbox_path.glob('*.csv'))
-            
-            if csv_files:
-                logging.info(f"Found {len(csv_files)} file(s) in {folder_name}/inbox/")
-            
-            valid_files = []
-            for csv_file in csv_files:
-                failed_path = paths[Directories.FAILED] / csv_file.name
-                
-                if FileValidator.validate_csv_filename(csv_file.name, product_code):
-                    valid_files.append(csv_file)
-                else:
-                    csv_file.rename(failed_path)
-                    logging.error(f"File moved to: {failed_path}")
+        products = self.plugin_manager.get_all_products()
+        with ThreadPoolExecutor(max_workers=max(len(products), 1), thread_name_prefix='inbox') as executor:
+            list(executor.map(self.scan_product_inbox, products))
+    
+    def scan_product_inbox(self, folder_name: str):
+        threading.current_thread().name = folder_name
+        
+        paths = self.plugin_manager.get_product_paths(folder_name)
+        inbox_path = paths[Directories.INBOX]
+        plugin = self.plugin_manager.get_plugin(folder_name)
+        product_code = plugin.product_code
+        
+        with os.scandir(inbox_path) as entries:
+            csv_files = sorted(
+                Path(entry.path) for entry in entries
+                if entry.name.endswith('.csv') and entry.is_file()
+            )
+        
+        if csv_files:
+            logging.info("Found %d file(s) in %s/inbox/", len(csv_files), folder_name)
+        
+        failed_dir = paths[Directories.FAILED]
+        invalid_count = 0
+        for csv_file in csv_files:
+            if not FileValidator.validate_csv_filename(csv_file.name, product_code):
+                os.replace(csv_file, failed_dir / csv_file.name)
+                invalid_count += 1
+                continue
             
-            for csv_file in valid_files:
-                try:
-                    self.csv_processor.process_csv_file(csv_file, folder_name, self.sql_dir)
-                except Exception as e:
-                    logging.error(f"Failed to process {csv_file.name}: {str(e)}")
+            try:
+                self.csv_processor.process_csv_file(csv_file, folder_name, self.sql_dir)
+            except Exception as e:
+                logging.error("Failed to process %s: %s", csv_file.name, e)
+        
+        if invalid_count:
+            logging.error("Moved %d invalid file(s) to: %s", invalid_count, failed_dir)
     
     
     
     def sftp_mode(self):
-        self.sftp_service.sftp_mode(self.sql_dir)
+        from common.SftpService import SftpService
+        
+        poll_interval = int(os.getenv('SFTP_POLL_INTERVAL', 60))
+        sftp_service = SftpService(self.plugin_manager, self.csv_processor, poll_interval)
+        sftp_service.sftp_mode(self.sql_dir)
+    
+    def close(self):
+        self.plugin_manager.close_all()
     
 
 
 if __name__ == '__main__':
+    runner = None
     try:
         runner = QueryRunner()
         
@@ -122,8 +149,10 @@ if __name__ == '__main__':
         logging.critical(get_separator())
         logging.critical("QUERY AUTOMATION FAILED")
         logging.critical(get_separator())
-        logging.critical(f"Error: {str(e)}")
-        logging.critical("Full stack trace:")
-        logging.critical(traceback.format_exc())
+        logging.critical("Error: %s", e)
+        logging.critical("Full stack trace:", exc_info=True)
         logging.critical(get_separator())
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+    finally:
+        if runner:
+            runner.close()
\ No newline at end of file
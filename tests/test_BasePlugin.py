@@ -0,0 +1,73 @@
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+try:
+    from common.BasePlugin import BasePlugin
+except ImportError as e:
+    raise unittest.SkipTest(f"BasePlugin dependencies not installed: {e}")
+
+
+class ItemPlugin(BasePlugin):
+    
+    def __init__(self, rows):
+        with mock.patch('common.BasePlugin.get_vault_client'):
+            super().__init__('TEST', None)
+        
+        cursor = mock.MagicMock()
+        cursor.description = [('ITEM_ID',), ('NAME',)]
+        cursor.fetchall.return_value = rows
+        self._db_conn = mock.MagicMock()
+        self._db_conn.cursor.return_value = cursor
+    
+    def get_prefetch_entities(self):
+        return [('ITEMS', 'item', ['item_id'])]
+    
+    def get_mutable_fields(self, table):
+        return []
+    
+    def process_row(self, row, metadata):
+        pass
+
+
+class PrefetchTest(unittest.TestCase):
+    
+    def prefetch(self, plugin, *item_ids):
+        plugin.prefetch_records([{'item.item_id': item_id} for item_id in item_ids])
+    
+    def test_integer_primary_keys_match_csv_strings(self):
+        plugin = ItemPlugin([(1, 'one'), (2, 'two')])
+        self.prefetch(plugin, '1', '2', '3')
+        
+        with mock.patch.object(plugin, '_fetch_record') as fetch_record:
+            self.assertEqual(plugin.fetch_current_record('ITEMS', {'item_id': '1'}), {'item_id': 1, 'name': 'one'})
+            self.assertEqual(plugin.fetch_current_record('ITEMS', {'item_id': '2'}), {'item_id': 2, 'name': 'two'})
+            self.assertIsNone(plugin.fetch_current_record('ITEMS', {'item_id': '3'}))
+            fetch_record.assert_not_called()
+    
+    def test_padded_char_primary_keys_match(self):
+        plugin = ItemPlugin([('A1  ', 'padded')])
+        self.prefetch(plugin, 'A1')
+        
+        with mock.patch.object(plugin, '_fetch_record') as fetch_record:
+            self.assertEqual(plugin.fetch_current_record('ITEMS', {'item_id': 'A1'})['name'], 'padded')
+            fetch_record.assert_not_called()
+    
+    def test_unmatched_rows_keep_matching_ones_cached(self):
+        plugin = ItemPlugin([(1, 'one'), ('01', 'zero-padded')])
+        self.prefetch(plugin, '1', '2')
+        
+        with mock.patch.object(plugin, '_fetch_record', return_value=None) as fetch_record:
+            self.assertEqual(plugin.fetch_current_record('ITEMS', {'item_id': '1'})['name'], 'one')
+            fetch_record.assert_not_called()
+            
+            self.assertIsNone(plugin.fetch_current_record('ITEMS', {'item_id': '2'}))
+            fetch_record.assert_called_once_with('ITEMS', {'item_id': '2'})
+
+
+if __name__ == '__main__':
+    unittest.main()
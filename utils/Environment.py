@@ -0,0 +1,7 @@
+import os
+import functools
+
+
+@functools.lru_cache(maxsize=None)
+def get_env() -> str:
+    return os.getenv('ENV', 'dev').lower()
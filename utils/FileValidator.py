@@ -1,32 +1,38 @@
-import re
 import logging
+import functools
 from pathlib import Path
+from typing import Optional, Tuple
 from common.Constants import FilePatterns
 
 class FileValidator:
     
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def parse_csv_filename(filename: str) -> Optional[Tuple[str, str, str]]:
+        match = FilePatterns.CSV_FILENAME.match(filename)
+        return match.groups() if match else None
+    
     @staticmethod
     def validate_csv_filename(filename: str, expected_product: str) -> bool:
-        match = re.match(FilePatterns.CSV_FILENAME, filename)
+        parts = FileValidator.parse_csv_filename(filename)
         
-        if not match:
+        if not parts:
             logging.error(
-                f"Skipping file with invalid name format: {filename}. "
-                f"Expected format: OLMID_PRODUCT_YYYYMMDD.csv"
+                "Skipping file with invalid name format: %s. Expected format: OLMID_PRODUCT_YYYYMMDD.csv",
+                filename
             )
             return False
         
-        olmid, file_product, date = match.groups()
+        olmid, file_product, date = parts
         
         if file_product != expected_product:
             logging.error(
-                f"Product code mismatch for file: {filename}. "
-                f"File product code '{file_product}' does not match folder product '{expected_product}'. "
-                f"File should be in products/{file_product.lower()}/inbox/"
+                "Product code mismatch for file: %s. "
+                "File product code '%s' does not match folder product '%s'. "
+                "File should be in products/%s/inbox/",
+                filename, file_product, expected_product, file_product.lower()
             )
             return False
         
-        logging.info(
-            f"Valid file: {filename} (OLMID: {olmid}, Product: {file_product}, Date: {date})"
-        )
+        logging.info("Valid file: %s (OLMID: %s, Product: %s, Date: %s)", filename, olmid, file_product, date)
         return True
@@ -1,9 +1,37 @@
+import os
 import shutil
 import logging
 import sys
-import re
+import threading
+import time
+import functools
 from common.Constants import Formatting as FormattingConstants
 
+_terminal_columns = None
+_terminal_checked_at = 0.0
+_stdout_is_tty = sys.stdout is not None and sys.stdout.isatty()
+
+def get_env_columns() -> int:
+    try:
+        columns = int(os.environ.get('COLUMNS', 0))
+    except ValueError:
+        columns = 0
+    return columns if columns > 0 else FormattingConstants.DEFAULT_COLUMNS
+
+def get_terminal_columns() -> int:
+    global _terminal_columns, _terminal_checked_at
+    
+    if not _stdout_is_tty:
+        if _terminal_columns is None:
+            _terminal_columns = get_env_columns()
+        return _terminal_columns
+    
+    now = time.monotonic()
+    if _terminal_columns is None or now - _terminal_checked_at > FormattingConstants.TERMINAL_REFRESH:
+        _terminal_columns = shutil.get_terminal_size().columns
+        _terminal_checked_at = now
+    return _terminal_columns
+
 def get_separator(char="="):
     try:
         frame = sys._getframe(1)
@@ -12,18 +40,19 @@ def get_separator(char="="):
         funcname = frame.f_code.co_name
         
         timestamp_width = FormattingConstants.TIMESTAMP_WIDTH
+        thread_width = len(f"[{threading.current_thread().name}]") + 1
         file_width = len(f"[{filename}:{lineno}]") + 1
         func_width = len(f"[{funcname}()]") + 1
         level_width = FormattingConstants.LEVEL_WIDTH
         
-        prefix_width = timestamp_width + file_width + func_width + level_width
+        prefix_width = timestamp_width + thread_width + file_width + func_width + level_width
         
-        terminal_width = shutil.get_terminal_size().columns
+        terminal_width = get_terminal_columns()
         message_width = max(terminal_width - prefix_width, 40)
         
     except Exception:
         try:
-            terminal_width = shutil.get_terminal_size().columns
+            terminal_width = get_terminal_columns()
             prefix_width = FormattingConstants.MAX_LOG_PREFIX_WIDTH
             message_width = max(terminal_width - prefix_width, 40)
         except Exception:
@@ -31,32 +60,34 @@ def get_separator(char="="):
     
     return char * message_width
 
+@functools.lru_cache(maxsize=None)
 def get_log_formatter():
     return logging.Formatter(
-        '[%(asctime)s] [%(filename)s:%(lineno)d] [%(funcName)s()] [%(levelname)s] %(message)s',
+        '[%(asctime)s] [%(threadName)s] [%(filename)s:%(lineno)d] [%(funcName)s()] [%(levelname)s] %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     
+def format_sql_value(value) -> str:
+    if value is None:
+        return 'NULL'
+    if isinstance(value, str):
+        if "'" in value:
+            value = value.replace("'", "''")
+        return f"'{value}'"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return f"'{str(value)}'"
+
 def format_sql(sql: str, params: list) -> str:
-    if not params:
+    if not params or ':' not in sql:
         return sql
     
-    formatted_sql = sql
+    formatted_values = [format_sql_value(value) for value in params]
     
-    for i, value in enumerate(params, start=1):
-        placeholder_pattern = rf':{i}(?!\d)'
-        
-        if value is None:
-            formatted_value = 'NULL'
-        elif isinstance(value, str):
-            escaped_value = value.replace("'", "''")
-            formatted_value = f"'{escaped_value}'"
-        elif isinstance(value, (int, float)):
-            formatted_value = str(value)
-        else:
-            formatted_value = f"'{str(value)}'"
-        
-        formatted_sql = re.sub(placeholder_pattern, formatted_value, formatted_sql)
+    def substitute(match):
+        index = int(match.group(1))
+        if 1 <= index <= len(formatted_values):
+            return formatted_values[index - 1]
+        return match.group(0)
     
-    return formatted_sql
-
+    return FormattingConstants.BIND_PLACEHOLDER.sub(substitute, sql)
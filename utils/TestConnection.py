@@ -17,44 +17,45 @@ logging.basicConfig(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
+_connection_pool = None
+
+def get_connection_pool():
+    global _connection_pool
+    
+    if _connection_pool is None:
+        from common.ConnectionPool import ConnectionPool
+        _connection_pool = ConnectionPool(min_size=1, max_size=2)
+    return _connection_pool
+
 def test_vault_and_db():
     try:
         from products.fastagacq.FastagAcqConfig import VaultConfig, Product
         from common.VaultClient import VaultClient
-        import oracledb
         
         env = os.getenv('ENV', 'dev')
-        logging.info(f"Testing connection for environment: {env}")
-        logging.info(f"Product: {Product.NAME}")
+        logging.info("Testing connection for environment: %s", env)
+        logging.info("Product: %s", Product.NAME)
         
         logging.info("Step 1: Testing Vault connection...")
         vault = VaultClient(VaultConfig)
-        logging.info(f"✓ Connected to Vault: {vault.vault_url}")
+        logging.info("✓ Connected to Vault: %s", vault.vault_url)
         
         logging.info("Step 2: Fetching database credentials...")
         creds = vault.get_db_credentials()
-        logging.info(f"✓ Retrieved credentials for host: {creds['host']}")
+        logging.info("✓ Retrieved credentials for host: %s", creds['host'])
         
         logging.info("Step 3: Testing database connection...")
-        dsn = oracledb.makedsn(
-            creds['host'],
-            creds['port'],
-            service_name=creds['database']
-        )
-        
-        conn = oracledb.connect(
-            user=creds['username'],
-            password=creds['password'],
-            dsn=dsn
-        )
-        
-        cursor = conn.cursor()
-        cursor.execute("SELECT 'Connection successful!' FROM DUAL")
-        result = cursor.fetchone()
-        cursor.close()
-        conn.close()
+        pool = get_connection_pool().get_pool(creds)
+        conn = pool.acquire()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 'Connection successful!' FROM DUAL")
+            result = cursor.fetchone()
+            cursor.close()
+        finally:
+            pool.release(conn)
         
-        logging.info(f"✓ Database connection successful: {result[0]}")
+        logging.info("✓ Database connection successful: %s", result[0])
         logging.info("")
         logging.info("=" * 50)
         logging.info("ALL TESTS PASSED ✓")
@@ -62,11 +63,11 @@ def test_vault_and_db():
         return True
         
     except Exception as e:
-        logging.error(f"✗ Test failed: {e}")
-        import traceback
-        logging.error(traceback.format_exc())
+        logging.error("✗ Test failed: %s", e, exc_info=True)
         return False
 
 if __name__ == '__main__':
     success = test_vault_and_db()
+    if _connection_pool is not None:
+        _connection_pool.close()
     sys.exit(0 if success else 1)